@@ -1,13 +1,18 @@
 import streamlit as st
 import os
-import json
-from datetime import datetime
+import functools
+import threading
 import pandas as pd
 import matplotlib.pyplot as plt
 import re
-from utils.text_processor import extract_key_concepts, generate_quiz
-from utils.pdf_extractor import extract_text_from_pdf
-from utils.deepseek_api import generate_quiz_from_text
+from utils.text_processor import extract_key_concepts, generate_quiz, select_relevant_passages
+from utils.deepseek_api import generate_quiz_from_text, grade_answers_async
+from utils.corpus_analytics import CorpusIndex
+from utils.note_manager import save_note, list_note_handles, remove_unused_artifacts
+from utils.stats_manager import (save_quiz_result, load_quiz_history, load_quiz_result,
+                                 apply_quiz_grades, GRADING_PENDING)
+from utils.job_queue import JobQueue, QUEUED, RUNNING, DONE
+from config import GRADING_MAX_PASSAGES
 
 # Configuration de la page
 st.set_page_config(
@@ -23,50 +28,24 @@ if not os.path.exists("data/notes"):
 if not os.path.exists("data/quiz_history"):
     os.makedirs("data/quiz_history")
 
-# Fonctions utilitaires pour la sauvegarde et le chargement des notes
-def save_note(title, content):
-    filename = f"data/notes/{title.replace(' ', '_')}.json"
-    data = {
-        "title": title,
-        "content": content,
-        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
-    return filename
+# Index des concepts partagé entre les sessions (mis à jour de façon incrémentale)
+@st.cache_resource
+def get_corpus_index():
+    return CorpusIndex()
 
-def load_notes():
-    notes = []
-    for filename in os.listdir("data/notes"):
-        if filename.endswith(".json"):
-            with open(f"data/notes/{filename}", "r", encoding="utf-8") as f:
-                note = json.load(f)
-                notes.append(note)
-    return notes
+# File d'attente des imports PDF partagée entre les sessions
+@st.cache_resource
+def get_job_queue():
+    return JobQueue()
 
-def save_quiz_result(note_title, questions, answers, scores):
-    filename = f"data/quiz_history/{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    data = {
-        "note_title": note_title,
-        "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "questions": questions,
-        "answers": answers,
-        "scores": scores,
-        "average_score": sum(scores) / len(scores) if scores else 0
-    }
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
-    return filename
+# Nettoyage des données dérivées orphelines, une fois par processus et en arrière-plan
+@st.cache_resource
+def start_artifact_cleanup():
+    thread = threading.Thread(target=remove_unused_artifacts, name="quizprep-artifact-cleanup", daemon=True)
+    thread.start()
+    return thread
 
-def load_quiz_history():
-    history = []
-    for filename in os.listdir("data/quiz_history"):
-        if filename.endswith(".json"):
-            with open(f"data/quiz_history/{filename}", "r", encoding="utf-8") as f:
-                quiz = json.load(f)
-                history.append(quiz)
-    return history
+start_artifact_cleanup()
 
 # Fonction pour nettoyer les balises HTML et formater les questions
 def clean_html_tags(text):
@@ -90,7 +69,8 @@ def clean_html_tags(text):
     
     return text
 
-# État de session
+# État de session (les notes y sont conservées sous forme de NoteHandle :
+# le contenu reste dans le cache partagé entre les sessions)
 if 'page' not in st.session_state:
     st.session_state.page = 'home'
 if 'current_note' not in st.session_state:
@@ -101,6 +81,8 @@ if 'quiz_answers' not in st.session_state:
     st.session_state.quiz_answers = []
 if 'quiz_scores' not in st.session_state:
     st.session_state.quiz_scores = []
+if 'grading_job' not in st.session_state:
+    st.session_state.grading_job = None
 
 # Barre latérale
 with st.sidebar:
@@ -139,7 +121,7 @@ def show_home_page():
     
     with col2:
         st.header("Statistiques rapides")
-        notes = load_notes()
+        notes = list_note_handles()
         quizzes = load_quiz_history()
         
         st.metric("Notes enregistrées", len(notes))
@@ -156,21 +138,21 @@ def show_notes_page():
     
     with col1:
         st.subheader("Notes existantes")
-        notes = load_notes()
+        notes = list_note_handles()
         
         if not notes:
             st.info("Aucune note trouvée. Créez votre première note!")
         
         for note in notes:
-            if st.button(f"📄 {note['title']}", key=f"note_{note['title']}", use_container_width=True):
+            if st.button(f"📄 {note.title}", key=f"note_{note.id}", use_container_width=True):
                 st.session_state.current_note = note
     
     with col2:
         tab1, tab2 = st.tabs(["Nouvelle note", "Importer un PDF"])
         
         with tab1:
-            note_title = st.text_input("Titre de la note", value="" if not st.session_state.current_note else st.session_state.current_note.get('title', ''))
-            note_content = st.text_area("Contenu de la note", height=300, value="" if not st.session_state.current_note else st.session_state.current_note.get('content', ''))
+            note_title = st.text_input("Titre de la note", value="" if not st.session_state.current_note else st.session_state.current_note.title)
+            note_content = st.text_area("Contenu de la note", height=300, value="" if not st.session_state.current_note else st.session_state.current_note.content)
             
             if st.button("Enregistrer la note", type="primary"):
                 if note_title and note_content:
@@ -187,17 +169,37 @@ def show_notes_page():
                 pdf_title = st.text_input("Titre de la note pour ce PDF")
                 
                 if st.button("Extraire le texte et enregistrer"):
-                    try:
-                        text_content = extract_text_from_pdf(uploaded_file)
-                        if pdf_title and text_content:
-                            save_note(pdf_title, text_content)
-                            st.success(f"PDF importé et enregistré sous '{pdf_title}'!")
-                            st.session_state.current_note = None
-                            st.rerun()
-                        else:
-                            st.error("Veuillez fournir un titre et vérifier que le PDF contient du texte.")
-                    except Exception as e:
-                        st.error(f"Erreur lors de l'extraction du PDF: {str(e)}")
+                    if pdf_title:
+                        get_job_queue().enqueue_pdf_import(pdf_title, uploaded_file)
+                        st.success(f"Import de '{pdf_title}' ajouté à la file d'attente.")
+                    else:
+                        st.error("Veuillez fournir un titre pour ce PDF.")
+            
+            show_import_jobs()
+
+# Progression des imports PDF en arrière-plan
+def show_import_jobs():
+    job_queue = get_job_queue()
+    # Reprendre les tâches abandonnées par un serveur arrêté (sans effet sur celles en cours)
+    job_queue.resume_pending()
+    jobs = job_queue.list_jobs()
+    if not jobs:
+        return
+    
+    st.subheader("Imports récents")
+    for job in jobs:
+        if job["status"] == DONE:
+            st.success(f"'{job['title']}' importé ({job['total_pages']} pages)")
+        elif job["status"] in (QUEUED, RUNNING):
+            progress = job["pages_done"] / job["total_pages"] if job["total_pages"] else 0.0
+            label = "en attente" if job["status"] == QUEUED else f"page {job['pages_done']}/{job['total_pages'] or '?'}"
+            st.progress(progress, text=f"'{job['title']}' : {label}")
+        else:
+            st.error(f"Erreur lors de l'extraction de '{job['title']}': {job['error']}")
+    
+    if any(job["status"] in (QUEUED, RUNNING) for job in jobs):
+        if st.button("Actualiser la progression"):
+            st.rerun()
 
 # Page de quiz
 def show_quiz_page():
@@ -207,16 +209,16 @@ def show_quiz_page():
     
     with col1:
         st.subheader("Choisir une note")
-        notes = load_notes()
+        notes = list_note_handles()
         
         if not notes:
             st.info("Aucune note trouvée. Créez une note d'abord!")
             return
         
-        note_titles = [note["title"] for note in notes]
+        note_titles = [note.title for note in notes]
         selected_note_title = st.selectbox("Sélectionner une note pour générer un quiz", note_titles)
         
-        selected_note = next((note for note in notes if note["title"] == selected_note_title), None)
+        selected_note = next((note for note in notes if note.title == selected_note_title), None)
         
         if selected_note:
             num_questions = st.slider("Nombre de questions", min_value=3, max_value=10, value=5)
@@ -225,7 +227,7 @@ def show_quiz_page():
                 with st.spinner("Génération du quiz en cours..."):
                     try:
                         # Utiliser l'API Deepseek pour générer des questions
-                        questions = generate_quiz_from_text(selected_note["content"], num_questions)
+                        questions = generate_quiz_from_text(selected_note.content, num_questions)
                         
                         # Assurer que le format des questions est correct
                         formatted_questions = []
@@ -269,8 +271,10 @@ def show_quiz_page():
                 st.rerun()
     
     with col2:
+        show_grading_status()
+        
         if st.session_state.quiz_questions:
-            st.subheader(f"Quiz sur: {st.session_state.current_note['title']}")
+            st.subheader(f"Quiz sur: {st.session_state.current_note.title}")
             
             # Afficher les questions et collecter les réponses
             for i, question in enumerate(st.session_state.quiz_questions):
@@ -292,21 +296,87 @@ def show_quiz_page():
                 st.session_state.quiz_scores[i] = score
                 st.divider()
             
+            auto_grade = st.checkbox("Correction automatique par l'IA",
+                                     help="Les réponses sont corrigées en un seul appel, en arrière-plan. "
+                                          "Votre auto-évaluation est conservée si la correction échoue.")
+            
             if st.button("Enregistrer les résultats", type="primary"):
-                save_quiz_result(
-                    st.session_state.current_note["title"],
-                    st.session_state.quiz_questions,
-                    st.session_state.quiz_answers,
-                    st.session_state.quiz_scores
-                )
-                st.success("Résultats enregistrés avec succès!")
-                st.balloons()
+                if auto_grade:
+                    note_content = st.session_state.current_note.content
+                    items = [
+                        {
+                            "question": question,
+                            "answer": answer,
+                            "passages": select_relevant_passages(note_content, f"{question} {answer}",
+                                                                 max_passages=GRADING_MAX_PASSAGES)
+                        }
+                        for question, answer in zip(st.session_state.quiz_questions,
+                                                    st.session_state.quiz_answers)
+                    ]
+                    # L'auto-évaluation est enregistrée tout de suite ; la correction met
+                    # à jour ce fichier en arrière-plan, même si la session se ferme entre-temps
+                    filename = save_quiz_result(
+                        st.session_state.current_note.title,
+                        st.session_state.quiz_questions,
+                        st.session_state.quiz_answers,
+                        st.session_state.quiz_scores,
+                        grading=GRADING_PENDING
+                    )
+                    grade_answers_async(items, callback=functools.partial(apply_quiz_grades, filename))
+                    st.session_state.grading_job = filename
+                    st.info("Résultats enregistrés. La correction automatique est en cours...")
+                else:
+                    save_quiz_result(
+                        st.session_state.current_note.title,
+                        st.session_state.quiz_questions,
+                        st.session_state.quiz_answers,
+                        st.session_state.quiz_scores
+                    )
+                    st.success("Résultats enregistrés avec succès!")
+                    st.balloons()
                 
                 # Réinitialiser le quiz
                 st.session_state.quiz_questions = []
                 st.session_state.quiz_answers = []
                 st.session_state.quiz_scores = []
 
+# Suivi de la correction automatique lancée en arrière-plan
+def show_grading_status():
+    filename = st.session_state.grading_job
+    if not filename:
+        return
+    
+    try:
+        result = load_quiz_result(filename)
+    except (OSError, ValueError):
+        st.session_state.grading_job = None
+        return
+    
+    grading = result.get("grading", {})
+    if grading.get("status") == GRADING_PENDING:
+        st.info("⏳ Correction automatique en cours...")
+        if st.button("Actualiser"):
+            st.rerun()
+        return
+    
+    st.session_state.grading_job = None
+    
+    answered = sum(1 for answer in result["answers"] if answer.strip())
+    if answered and grading.get("model_graded", 0) == 0:
+        st.warning("La correction automatique n'a pu noter aucune réponse (API indisponible ou réponse illisible). "
+                   "Votre auto-évaluation a été conservée.")
+    else:
+        if grading.get("ungraded"):
+            st.warning(f"{grading['ungraded']} réponse(s) n'ont pas pu être corrigées : "
+                       "votre auto-évaluation a été conservée pour celles-ci.")
+        st.success("Correction terminée et résultats mis à jour!")
+    
+    feedback = result.get("feedback") or [""] * len(result["questions"])
+    for i, (question, score, comment) in enumerate(zip(result["questions"], result["scores"], feedback)):
+        st.markdown(f"**Question {i+1}:** {question}")
+        st.markdown(f"Score: **{score}/5**" + (f" — {comment}" if comment else ""))
+    st.divider()
+
 # Page de statistiques
 def show_stats_page():
     st.title("📊 Suivi des Performances")
@@ -366,9 +436,45 @@ def show_stats_page():
         
         st.pyplot(fig)
     
+    st.subheader("Analyse des concepts")
+    show_concept_analysis(quiz_history)
+    
     st.subheader("Historique détaillé des quiz")
     st.dataframe(df)
 
+# Analyse des concepts, calculée en arrière-plan pour ne pas bloquer la page
+def show_concept_analysis(quiz_history):
+    corpus_index = get_corpus_index()
+    corpus_index.start_sync(list_note_handles())
+    
+    if not corpus_index.ready:
+        done, total = corpus_index.sync_progress
+        st.info(f"⏳ Analyse des notes en cours ({done}/{total} notes traitées)...")
+        if st.button("Actualiser l'analyse"):
+            st.rerun()
+        return
+    
+    if corpus_index.syncing:
+        st.caption("Mise à jour de l'analyse en arrière-plan : les résultats peuvent dater un peu.")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("**Concepts à retravailler**")
+        weakest = corpus_index.weakest_concepts(quiz_history)
+        if weakest:
+            st.dataframe(pd.DataFrame(weakest, columns=["Concept", "Score moyen", "Questions"]),
+                         hide_index=True)
+        else:
+            st.info("Pas encore assez de questions évaluées pour identifier des concepts faibles.")
+    
+    with col2:
+        st.markdown("**Concepts clés de l'ensemble des notes**")
+        corpus_concepts = corpus_index.corpus_concepts()
+        if corpus_concepts:
+            st.dataframe(pd.DataFrame(corpus_concepts, columns=["Concept", "Poids TF-IDF"]),
+                         hide_index=True)
+
 # Affichage de la page en fonction de l'état
 if st.session_state.page == 'home':
     show_home_page()
@@ -0,0 +1,130 @@
+"""
+Mesure de l'empreinte mémoire par session Streamlit : état de session avec
+notes complètes (ancien fonctionnement) contre NoteHandle + cache partagé.
+
+Chaque session simulée ouvre une note et garde un quiz de 5 questions.
+Le corpus synthétique (phrases françaises ponctuées, découpées en blocs comme
+des notes réelles) est créé dans un dossier temporaire.
+
+Utilisation :
+    python benchmarks/bench_session_memory.py --sessions 200 --notes 50 --note-kb 100
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+import tempfile
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARKS_FOLDER = os.path.join(REPO_ROOT, "benchmarks")
+
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, BENCHMARKS_FOLDER)
+
+from synthetic import generate_french_text, generate_sentence
+
+def _quiz_state(rng):
+    questions = [f"Expliquez : {generate_sentence(rng)}" for _ in range(5)]
+    return {
+        "quiz_questions": questions,
+        "quiz_answers": [generate_french_text(300, rng.random()) for _ in questions],
+        "quiz_scores": [rng.randint(0, 5) for _ in questions]
+    }
+
+def _measure(build_sessions):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sessions = build_sessions()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return sessions, after - before
+
+def run(num_sessions=200, num_notes=50, note_kb=100, seed=0):
+    """
+    Simule num_sessions sessions sur un corpus de num_notes notes
+
+    Returns:
+        dict: Empreintes totales et par session (en octets) des deux modes
+    """
+    with tempfile.TemporaryDirectory() as workdir:
+        # config.py crée les dossiers de données relativement au dossier courant
+        os.chdir(workdir)
+        from utils import note_manager
+
+        for i in range(num_notes):
+            note_manager.save_note(f"Note {i}", generate_french_text(note_kb * 1024, seed + i))
+        filenames = sorted(os.listdir(note_manager.NOTES_FOLDER))
+
+        def legacy_sessions():
+            # Ancien fonctionnement : chaque session garde sa propre copie de la note
+            session_rng = random.Random(seed)
+            sessions = []
+            for i in range(num_sessions):
+                path = os.path.join(note_manager.NOTES_FOLDER, filenames[i % num_notes])
+                with open(path, "r", encoding="utf-8") as f:
+                    note = json.load(f)
+                note["content"] = note_manager.note_content(note)
+                sessions.append({"page": "quiz", "current_note": note, **_quiz_state(session_rng)})
+            return sessions
+
+        def warm_cache():
+            # Le cache est rempli une fois pour toutes les sessions du processus
+            for handle in note_manager.list_note_handles():
+                handle.content
+
+        def compact_sessions():
+            session_rng = random.Random(seed)
+            handles = note_manager.list_note_handles()
+            sessions = []
+            for i in range(num_sessions):
+                handle = handles[i % num_notes]
+                handle.content  # Lecture paresseuse, servie par le cache partagé
+                sessions.append({"page": "quiz", "current_note": handle, **_quiz_state(session_rng)})
+            return sessions
+
+        note_manager._note_cache.clear()
+        note_manager._titles.clear()
+        legacy, legacy_bytes = _measure(legacy_sessions)
+        del legacy
+
+        _, shared_bytes = _measure(warm_cache)
+        compact, compact_bytes = _measure(compact_sessions)
+        del compact
+        os.chdir(REPO_ROOT)
+
+    return {
+        "sessions": num_sessions,
+        "notes": num_notes,
+        "note_kb": note_kb,
+        "legacy_total_bytes": legacy_bytes,
+        "legacy_per_session_bytes": legacy_bytes // num_sessions,
+        "compact_total_bytes": shared_bytes + compact_bytes,
+        "compact_per_session_bytes": compact_bytes // num_sessions,
+        "shared_cache_bytes": shared_bytes
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Empreinte mémoire par session Streamlit")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--notes", type=int, default=50)
+    parser.add_argument("--note-kb", type=int, default=100)
+    parser.add_argument("--json", action="store_true", help="Affiche le résultat en JSON")
+    args = parser.parse_args(argv)
+
+    result = run(args.sessions, args.notes, args.note_kb)
+    if args.json:
+        print(json.dumps(result, indent=4))
+        return
+
+    print(f"{result['sessions']} sessions, {result['notes']} notes de {result['note_kb']} Ko")
+    print(f"  Notes complètes : {result['legacy_total_bytes'] / 1e6:8.1f} Mo au total, "
+          f"{result['legacy_per_session_bytes'] / 1e3:8.1f} Ko par session")
+    print(f"  NoteHandle      : {result['compact_total_bytes'] / 1e6:8.1f} Mo au total, "
+          f"{result['compact_per_session_bytes'] / 1e3:8.1f} Ko par session "
+          f"(+ {result['shared_cache_bytes'] / 1e6:.1f} Mo de cache partagé)")
+
+if __name__ == "__main__":
+    main()
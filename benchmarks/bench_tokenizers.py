@@ -0,0 +1,158 @@
+"""
+Comparaison des backends de découpage "regex" et "nltk" sur le corpus de notes :
+- précision : frontières de phrases et termes extraits du backend regex,
+  mesurés par rapport à punkt / Treebank
+- débit : caractères traités par seconde pour chaque backend
+
+Utilisation (depuis la racine du dépôt) :
+    python benchmarks/bench_tokenizers.py [--repeat 5] [--json]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from collections import Counter
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from utils.tokenizers import create_tokenizer
+from utils.text_processor import clean_text
+
+def sentence_boundaries(text, sentences):
+    """
+    Convertit une liste de phrases en positions de fin dans le texte
+    """
+    boundaries = set()
+    cursor = 0
+    for sentence in sentences:
+        position = text.find(sentence, cursor)
+        if position < 0:
+            continue
+        cursor = position + len(sentence)
+        boundaries.add(cursor)
+    # La fin du texte est une frontière triviale, commune aux deux backends
+    boundaries.discard(len(text.rstrip()))
+    return boundaries
+
+def significant_terms(tokenizer, text):
+    words = tokenizer.word_tokenize(text.lower())
+    return Counter(w for w in words if w.isalnum() and w not in tokenizer.stopwords and len(w) > 2)
+
+def compare_accuracy(texts, candidate, reference):
+    """
+    Mesure l'accord du backend candidat avec le backend de référence
+
+    Returns:
+        dict: précision / rappel / F1 des frontières de phrases, accord des
+              termes significatifs et recouvrement des 10 concepts principaux
+    """
+    true_positives = predicted = expected = 0
+    shared_terms = candidate_terms = reference_terms = 0
+    top_overlap = []
+
+    for text in texts:
+        found = sentence_boundaries(text, candidate.sent_tokenize(text))
+        truth = sentence_boundaries(text, reference.sent_tokenize(text))
+        true_positives += len(found & truth)
+        predicted += len(found)
+        expected += len(truth)
+
+        terms = significant_terms(candidate, text)
+        truth_terms = significant_terms(reference, text)
+        shared_terms += sum((terms & truth_terms).values())
+        candidate_terms += sum(terms.values())
+        reference_terms += sum(truth_terms.values())
+
+        top = {term for term, _ in terms.most_common(10)}
+        truth_top = {term for term, _ in truth_terms.most_common(10)}
+        if truth_top:
+            top_overlap.append(len(top & truth_top) / len(truth_top))
+
+    precision = true_positives / predicted if predicted else 1.0
+    recall = true_positives / expected if expected else 1.0
+    return {
+        "sentence_precision": round(precision, 4),
+        "sentence_recall": round(recall, 4),
+        "sentence_f1": round(2 * precision * recall / (precision + recall), 4) if precision + recall else 0.0,
+        "term_precision": round(shared_terms / candidate_terms, 4) if candidate_terms else 1.0,
+        "term_recall": round(shared_terms / reference_terms, 4) if reference_terms else 1.0,
+        "top10_concept_overlap": round(sum(top_overlap) / len(top_overlap), 4) if top_overlap else 1.0
+    }
+
+def measure_throughput(texts, tokenizer, repeat=5):
+    """
+    Mesure le débit (caractères par seconde) du découpage en phrases et en mots
+    """
+    total_chars = sum(len(text) for text in texts) * repeat
+    result = {}
+    for operation in ("sent_tokenize", "word_tokenize"):
+        function = getattr(tokenizer, operation)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for text in texts:
+                function(text)
+        elapsed = time.perf_counter() - start
+        result[f"{operation}_chars_per_s"] = round(total_chars / elapsed) if elapsed else None
+    return result
+
+def load_corpus():
+    # config.py utilise des chemins relatifs au dossier courant
+    os.chdir(REPO_ROOT)
+    from utils.note_manager import load_notes
+    return [clean_text(note["content"]) for note in load_notes()]
+
+def run(repeat=5, texts=None):
+    texts = load_corpus() if texts is None else texts
+    result = {
+        "documents": len(texts),
+        "characters": sum(len(text) for text in texts),
+        "throughput": {}
+    }
+
+    regex = create_tokenizer("regex")
+    result["throughput"]["regex"] = measure_throughput(texts, regex, repeat)
+
+    try:
+        nltk_tokenizer = create_tokenizer("nltk")
+        nltk_tokenizer.sent_tokenize("Test. Test.")
+    except Exception as e:
+        # Ressources punkt absentes et téléchargement impossible
+        lines = [line.strip(" *") for line in str(e).splitlines()]
+        result["nltk_error"] = next((line for line in lines if line), repr(e))
+        return result
+
+    result["throughput"]["nltk"] = measure_throughput(texts, nltk_tokenizer, repeat)
+    result["accuracy_vs_nltk"] = compare_accuracy(texts, regex, nltk_tokenizer)
+    for operation in ("sent_tokenize", "word_tokenize"):
+        key = f"{operation}_chars_per_s"
+        result[f"{operation}_speedup"] = round(
+            result["throughput"]["regex"][key] / result["throughput"]["nltk"][key], 2)
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Précision et débit des backends de découpage")
+    parser.add_argument("--repeat", type=int, default=5, help="Nombre de passes sur le corpus")
+    parser.add_argument("--json", action="store_true", help="Affiche le résultat en JSON")
+    args = parser.parse_args(argv)
+
+    result = run(args.repeat)
+    if args.json:
+        print(json.dumps(result, indent=4, ensure_ascii=False))
+        return
+
+    print(f"Corpus : {result['documents']} note(s), {result['characters']} caractères")
+    for backend, throughput in result["throughput"].items():
+        print(f"  {backend:6s} phrases : {throughput['sent_tokenize_chars_per_s'] / 1e6:7.2f} M car./s   "
+              f"mots : {throughput['word_tokenize_chars_per_s'] / 1e6:7.2f} M car./s")
+    if "accuracy_vs_nltk" in result:
+        print("Accord du backend regex avec NLTK :")
+        for metric, value in result["accuracy_vs_nltk"].items():
+            print(f"  {metric:24s} {value:.4f}")
+    else:
+        print(f"NLTK indisponible, comparaison impossible : {result['nltk_error']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""
+Suite de benchmarks de QuizPrep.
+
+Mesure le traitement de texte, l'extraction PDF, le parsing des réponses d'API
+et le chargement des notes et de l'historique, sur des données synthétiques.
+Les résultats sont écrits en JSON et comparés à une référence (baseline)
+avec des seuils de régression configurables. La référence dépend de la
+machine : elle n'est pas versionnée et se crée localement avec --update-baseline.
+Les seuils propres à certains benchmarks sont versionnés dans thresholds.json.
+
+Utilisation (depuis la racine du dépôt) :
+    python benchmarks/run_benchmarks.py                       # profil "quick"
+    python benchmarks/run_benchmarks.py --profile full        # 1 Ko à 50 Mo, 10 à 100k fichiers
+    python benchmarks/run_benchmarks.py --update-baseline     # enregistre la référence locale
+    python benchmarks/run_benchmarks.py --threshold 0.3 --only clean_text,load_notes
+
+Le code de sortie vaut 1 si au moins un benchmark régresse au-delà de son seuil.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import tempfile
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARKS_FOLDER = os.path.join(REPO_ROOT, "benchmarks")
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_FOLDER, "baseline.json")
+DEFAULT_THRESHOLDS = os.path.join(BENCHMARKS_FOLDER, "thresholds.json")
+DEFAULT_OUTPUT = os.path.join(BENCHMARKS_FOLDER, "results.json")
+
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, BENCHMARKS_FOLDER)
+
+KB = 1024
+MB = 1024 * KB
+
+PROFILES = {
+    "quick": {
+        "text_sizes": [1 * KB, 100 * KB, 1 * MB],
+        "pdf_sizes": [100 * KB, 1 * MB],
+        "file_counts": [10, 1000],
+        "repeat": 5
+    },
+    "full": {
+        "text_sizes": [1 * KB, 100 * KB, 1 * MB, 10 * MB, 50 * MB],
+        "pdf_sizes": [1 * KB, 1 * MB, 10 * MB, 50 * MB],
+        "file_counts": [10, 1000, 10000, 100000],
+        "repeat": 3
+    }
+}
+
+# Au-delà de cette durée, une mesure n'est pas répétée
+MAX_REPEAT_SECONDS = 5.0
+
+# Informations de la référence qui doivent correspondre pour que la comparaison ait un sens
+COMPARABLE_META = ("python", "platform", "machine", "tokenizer")
+
+def format_size(num_bytes):
+    if num_bytes >= MB:
+        return f"{num_bytes // MB}MB"
+    return f"{num_bytes // KB}KB"
+
+def parse_size(value):
+    """
+    Convertit "1KB", "50MB" ou "2048" en nombre d'octets
+    """
+    value = value.strip().upper()
+    for suffix, factor in (("MB", MB), ("KB", KB), ("B", 1)):
+        if value.endswith(suffix):
+            return int(float(value[:-len(suffix)]) * factor)
+    return int(value)
+
+def load_json(path, default=None):
+    if not os.path.exists(path):
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def time_function(function, repeat, setup=None):
+    """
+    Chronomètre une fonction (la préparation éventuelle n'est pas mesurée)
+
+    Returns:
+        dict: {"min_s", "median_s", "runs"}
+    """
+    durations = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+        if durations[-1] > MAX_REPEAT_SECONDS:
+            break
+    return {
+        "min_s": round(min(durations), 6),
+        "median_s": round(statistics.median(durations), 6),
+        "runs": len(durations)
+    }
+
+def text_cases(sizes):
+    """
+    Benchmarks sur du texte : nettoyage, concepts clés, quiz, parsing des réponses
+    """
+    from synthetic import generate_french_text, generate_api_response
+    from utils.pdf_extractor import clean_pdf_text
+    from utils.text_processor import clean_text, extract_key_concepts, generate_quiz
+    from utils.deepseek_api import parse_questions_from_response
+
+    for size in sizes:
+        label = format_size(size)
+        text = generate_french_text(size)
+        # Texte brut tel qu'extrait d'un PDF : retours à la ligne et numéros de page
+        raw_pdf_text = text.replace(". ", ".\n").replace("\n\n", "\n\n12\n\n")
+        num_questions = max(1, size // 100)
+        response = generate_api_response(num_questions)
+
+        # Entrées liées par argument par défaut : chaque cas garde la sienne
+        # même si le générateur est entièrement parcouru avant les mesures
+        yield f"clean_pdf_text[{label}]", lambda raw_pdf_text=raw_pdf_text: clean_pdf_text(raw_pdf_text), None
+        yield f"clean_text[{label}]", lambda text=text: clean_text(text), None
+        yield f"extract_key_concepts[{label}]", lambda text=text: extract_key_concepts(text), None
+        yield f"generate_quiz[{label}]", lambda text=text: generate_quiz(text, 5), None
+        yield (f"parse_questions_from_response[{label}]",
+               lambda response=response, num_questions=num_questions:
+                   parse_questions_from_response(response, num_questions), None)
+
+def pdf_cases(sizes):
+    """
+    Benchmarks d'extraction de texte de PDF synthétiques
+    """
+    from synthetic import generate_pdf
+    from utils.pdf_extractor import extract_text_from_pdf
+
+    for size in sizes:
+        pdf_file = io.BytesIO(generate_pdf(size))
+        yield (f"extract_text_from_pdf[{format_size(size)}]",
+               lambda pdf_file=pdf_file: extract_text_from_pdf(pdf_file), None)
+
+def storage_cases(file_counts, workdir):
+    """
+    Benchmarks de chargement des notes et de l'historique, à froid (cache vidé)
+    et à chaud pour les notes
+    """
+    from synthetic import write_notes, write_quiz_history
+    from utils import note_manager, stats_manager
+
+    def clear_caches():
+        note_manager._note_cache.clear()
+        note_manager._titles.clear()
+
+    for count in file_counts:
+        folder = os.path.join(workdir, f"storage_{count}")
+        write_notes(os.path.join(folder, "notes"), count)
+        write_quiz_history(os.path.join(folder, "quiz_history"), count)
+
+        def use_folder(folder=folder):
+            note_manager.NOTES_FOLDER = os.path.join(folder, "notes")
+            stats_manager.QUIZ_HISTORY_FOLDER = os.path.join(folder, "quiz_history")
+
+        def cold(use_folder=use_folder):
+            use_folder()
+            clear_caches()
+
+        yield f"load_notes[{count} files, cold]", note_manager.load_notes, cold
+        yield f"load_notes[{count} files, warm]", note_manager.load_notes, use_folder
+        yield f"load_quiz_history[{count} files]", stats_manager.load_quiz_history, use_folder
+
+def run(profile, only=None, repeat=None, progress=print):
+    """
+    Exécute les benchmarks d'un profil
+
+    Args:
+        profile (dict): Tailles et nombres de fichiers (voir PROFILES)
+        only (list): Préfixes de noms de benchmarks à exécuter (tous par défaut)
+        repeat (int): Nombre de mesures par benchmark (celui du profil par défaut)
+
+    Returns:
+        dict: {"meta": ..., "results": {nom: mesures}}
+    """
+    repeat = repeat or profile["repeat"]
+    results = {}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # config.py crée les dossiers de données relativement au dossier courant
+        previous_cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            from config import TOKENIZER_BACKEND
+            cases = [
+                text_cases(profile["text_sizes"]),
+                pdf_cases(profile["pdf_sizes"]),
+                storage_cases(profile["file_counts"], workdir)
+            ]
+            for generator in cases:
+                for name, function, setup in generator:
+                    if only and not any(name.startswith(prefix) for prefix in only):
+                        continue
+                    results[name] = time_function(function, repeat, setup)
+                    progress(f"  {name:55s} {results[name]['min_s'] * 1000:12.3f} ms")
+        finally:
+            os.chdir(previous_cwd)
+
+    return {
+        "meta": {
+            "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            # extract_key_concepts et generate_quiz dépendent du backend de découpage
+            "tokenizer": TOKENIZER_BACKEND
+        },
+        "results": results
+    }
+
+def compare(results, baseline, threshold, thresholds=None, noise_floor_s=0.001):
+    """
+    Compare des résultats à une référence
+
+    Args:
+        results (dict): Résultats de run()
+        baseline (dict): Référence au même format
+        threshold (float): Seuil par défaut (0.25 = 25 % plus lent)
+        thresholds (dict): Seuils propres à certains benchmarks {nom: seuil}
+        noise_floor_s (float): Durées de référence en dessous desquelles
+                               les écarts sont ignorés (bruit de mesure)
+
+    Returns:
+        list: Liste de dictionnaires {"name", "baseline_s", "current_s", "ratio",
+              "threshold", "status"} où status vaut "ok", "regression",
+              "improvement", "noise" ou "new"
+    """
+    thresholds = thresholds or {}
+    reference = baseline.get("results", {})
+    comparison = []
+
+    for name, measure in results["results"].items():
+        entry = {"name": name, "current_s": measure["min_s"], "baseline_s": None,
+                 "ratio": None, "threshold": thresholds.get(name, threshold), "status": "new"}
+        if name in reference:
+            entry["baseline_s"] = reference[name]["min_s"]
+            entry["ratio"] = round(measure["min_s"] / entry["baseline_s"], 3) if entry["baseline_s"] else None
+            if entry["baseline_s"] < noise_floor_s and measure["min_s"] < noise_floor_s:
+                entry["status"] = "noise"
+            elif entry["ratio"] is not None and entry["ratio"] > 1 + entry["threshold"]:
+                entry["status"] = "regression"
+            elif entry["ratio"] is not None and entry["ratio"] < 1 / (1 + entry["threshold"]):
+                entry["status"] = "improvement"
+            else:
+                entry["status"] = "ok"
+        comparison.append(entry)
+
+    return comparison
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de QuizPrep")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--text-sizes", help="Tailles de texte, ex: 1KB,1MB,50MB")
+    parser.add_argument("--pdf-sizes", help="Tailles de PDF, ex: 100KB,10MB")
+    parser.add_argument("--file-counts", help="Nombres de fichiers, ex: 10,1000,100000")
+    parser.add_argument("--repeat", type=int, help="Nombre de mesures par benchmark")
+    parser.add_argument("--only", help="Préfixes de benchmarks à exécuter, séparés par des virgules")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Fichier JSON des résultats")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Fichier JSON de référence")
+    parser.add_argument("--thresholds", default=DEFAULT_THRESHOLDS,
+                        help="Fichier JSON des seuils propres à certains benchmarks")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Ralentissement toléré par défaut (0.25 = 25 %%)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Remplace la référence par les résultats courants")
+    args = parser.parse_args(argv)
+
+    profile = dict(PROFILES[args.profile])
+    if args.text_sizes:
+        profile["text_sizes"] = [parse_size(size) for size in args.text_sizes.split(",")]
+    if args.pdf_sizes:
+        profile["pdf_sizes"] = [parse_size(size) for size in args.pdf_sizes.split(",")]
+    if args.file_counts:
+        profile["file_counts"] = [int(count) for count in args.file_counts.split(",")]
+    only = [prefix.strip() for prefix in args.only.split(",")] if args.only else None
+
+    print(f"Profil {args.profile} :")
+    results = run(profile, only, args.repeat)
+    results["meta"]["profile"] = args.profile
+
+    baseline = load_json(args.baseline, {})
+    thresholds = load_json(args.thresholds, {})
+
+    comparison = compare(results, baseline, args.threshold, thresholds)
+    results["comparison"] = comparison
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=4)
+    print(f"Résultats : {args.output}")
+
+    if args.update_baseline:
+        # La référence ne contient que des mesures, les seuils restent dans thresholds.json
+        updated = {"meta": results["meta"],
+                   "results": {**baseline.get("results", {}), **results["results"]}}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(updated, f, ensure_ascii=False, indent=4)
+        print(f"Référence mise à jour : {args.baseline}")
+        return 0
+
+    if not baseline:
+        print("Aucune référence : lancez avec --update-baseline pour en enregistrer une.")
+        return 0
+
+    reference_meta = baseline.get("meta", {})
+    if any(reference_meta.get(key) != results["meta"][key] for key in COMPARABLE_META):
+        print(f"Attention : référence mesurée dans un autre environnement "
+              f"({reference_meta.get('platform')}, Python {reference_meta.get('python')}, "
+              f"découpage {reference_meta.get('tokenizer')}) : régénérez-la avec --update-baseline.")
+
+    regressions = [entry for entry in comparison if entry["status"] == "regression"]
+    for entry in comparison:
+        if entry["status"] in ("regression", "improvement"):
+            print(f"  {entry['status']:11s} {entry['name']:55s} x{entry['ratio']:.2f} "
+                  f"(seuil {entry['threshold']:.0%})")
+    print(f"{len(regressions)} régression(s) sur {len(comparison)} benchmark(s)")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+Générateurs de données synthétiques pour les benchmarks : notes en français,
+PDF de taille configurable, réponses d'API et historiques de quiz
+"""
+
+import os
+import json
+import random
+
+_SUBJECTS = ("Le protocole TCP", "La programmation orientée objet", "Une base de données relationnelle",
+             "L'algorithme de tri rapide", "Le modèle OSI", "La mémoire virtuelle", "Un compilateur",
+             "La balise HTML", "Le système d'exploitation", "L'apprentissage automatique")
+_VERBS = ("assure", "définit", "optimise", "garantit", "décrit", "transforme", "organise", "contrôle")
+_OBJECTS = ("la fiabilité des échanges", "l'encapsulation des données", "l'intégrité des transactions",
+            "la complexité moyenne en O(n log n)", "les sept couches du réseau", "la pagination des processus",
+            "l'analyse syntaxique du code source", "la structure du document", "l'ordonnancement des tâches",
+            "la généralisation à partir d'exemples")
+_COMPLEMENTS = ("grâce à des mécanismes d'acquittement", "c.-à-d. en masquant l'implémentation",
+                "selon les propriétés ACID", "dans le cas moyen", "cf. chap. 3 du cours",
+                "avec une table des pages", "en 3,5 étapes en moyenne", "etc.", "d'après M. Dupont",
+                "lorsqu'on l'applique à grande échelle")
+
+def generate_sentence(rng):
+    sentence = f"{rng.choice(_SUBJECTS)} {rng.choice(_VERBS)} {rng.choice(_OBJECTS)} {rng.choice(_COMPLEMENTS)}"
+    return sentence if sentence.endswith(".") else sentence + "."
+
+def generate_french_text(num_bytes, seed=0):
+    """
+    Génère un texte de notes en français d'environ num_bytes octets (UTF-8),
+    découpé en paragraphes
+
+    Args:
+        num_bytes (int): Taille visée, en octets
+        seed (int): Graine du générateur aléatoire
+
+    Returns:
+        str: Le texte généré
+    """
+    rng = random.Random(seed)
+    paragraphs = []
+    size = 0
+    while size < num_bytes:
+        paragraph = " ".join(generate_sentence(rng) for _ in range(rng.randint(3, 8)))
+        paragraphs.append(paragraph)
+        size += len(paragraph.encode("utf-8")) + 2
+    return "\n\n".join(paragraphs)
+
+def _pdf_string(text):
+    escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return escaped.encode("cp1252", errors="replace")
+
+def generate_pdf(num_bytes, seed=0, lines_per_page=45, line_chars=90):
+    """
+    Génère un PDF textuel (police Helvetica, une colonne) d'environ num_bytes octets
+
+    Args:
+        num_bytes (int): Taille visée, en octets
+        seed (int): Graine du générateur aléatoire
+
+    Returns:
+        bytes: Le contenu du fichier PDF
+    """
+    text = generate_french_text(num_bytes, seed).replace("\n\n", " ")
+
+    # Découper le texte en lignes de longueur fixe, puis en pages
+    lines = []
+    for start in range(0, len(text), line_chars):
+        lines.append(text[start:start + line_chars])
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[""]]
+
+    num_pages = len(pages)
+    font_id = 3 + 2 * num_pages
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        ("<< /Type /Pages /Kids [%s] /Count %d >>" %
+         (" ".join(f"{3 + 2 * i} 0 R" for i in range(num_pages)), num_pages)).encode()
+    ]
+    for i, page_lines in enumerate(pages):
+        stream = b"BT /F1 10 Tf 14 TL 40 800 Td " + b" ".join(
+            b"(" + _pdf_string(line) + b") Tj T*" for line in page_lines) + b" ET"
+        objects.append((f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                        f"/Contents {4 + 2 * i} 0 R /Resources << /Font << /F1 {font_id} 0 R >> >> >>").encode())
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(output)
+
+def generate_api_response(num_questions, seed=0):
+    """
+    Génère une réponse d'API au format attendu par parse_questions_from_response
+    """
+    rng = random.Random(seed)
+    lines = ["Voici les questions demandées :", ""]
+    for i in range(num_questions):
+        lines.append(f"{i + 1}. Expliquez comment {generate_sentence(rng)[:-1].lower()} ?")
+    return "\n".join(lines)
+
+def write_notes(notes_folder, count, note_bytes=1024, seed=0):
+    """
+    Écrit count notes au format de note_manager (blocs) dans notes_folder
+    """
+    from utils.note_manager import split_into_blocks
+
+    os.makedirs(notes_folder, exist_ok=True)
+    for i in range(count):
+        data = {
+            "title": f"Note {i}",
+            "created_at": "2024-01-01 00:00:00",
+            "updated_at": "2024-01-01 00:00:00",
+            "version": 1,
+            "blocks": split_into_blocks(generate_french_text(note_bytes, seed + i))
+        }
+        with open(os.path.join(notes_folder, f"Note_{i}.json"), "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+
+def write_quiz_history(history_folder, count, num_questions=5, seed=0):
+    """
+    Écrit count résultats de quiz au format de stats_manager dans history_folder
+    """
+    rng = random.Random(seed)
+    os.makedirs(history_folder, exist_ok=True)
+    for i in range(count):
+        scores = [rng.randint(0, 5) for _ in range(num_questions)]
+        data = {
+            "note_title": f"Note {i % 100}",
+            "date": "2024-01-01 00:00:00",
+            "questions": [f"Expliquez: {generate_sentence(rng)}" for _ in range(num_questions)],
+            "answers": [generate_sentence(rng) for _ in range(num_questions)],
+            "scores": scores,
+            "average_score": sum(scores) / num_questions
+        }
+        with open(os.path.join(history_folder, f"{i:08d}.json"), "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
@@ -35,11 +35,53 @@ DEFAULT_MAX_QUESTIONS = 10
 DATA_FOLDER = "data"
 NOTES_FOLDER = os.path.join(DATA_FOLDER, "notes")
 QUIZ_HISTORY_FOLDER = os.path.join(DATA_FOLDER, "quiz_history")
+DERIVED_FOLDER = os.path.join(DATA_FOLDER, "derived")  # Données dérivées, par bloc de note
 
 # Création des répertoires s'ils n'existent pas
 os.makedirs(DATA_FOLDER, exist_ok=True)
 os.makedirs(NOTES_FOLDER, exist_ok=True)
 os.makedirs(QUIZ_HISTORY_FOLDER, exist_ok=True)
+os.makedirs(DERIVED_FOLDER, exist_ok=True)
 
 # Configuration des types de contenu supportés
-SUPPORTED_FILE_TYPES = ["pdf", "txt"]
\ No newline at end of file
+SUPPORTED_FILE_TYPES = ["pdf", "txt"]
+
+# Correction automatique des réponses (un seul appel groupé par quiz)
+GRADING_CACHE_FOLDER = os.path.join(DATA_FOLDER, "grading_cache")
+GRADING_MAX_PASSAGES = 2  # Passages des notes joints à chaque question
+GRADING_MAX_WORKERS = 2   # Threads dédiés aux corrections en arrière-plan
+
+os.makedirs(GRADING_CACHE_FOLDER, exist_ok=True)
+
+
+# Découpage des notes en blocs adressés par leur contenu
+NOTE_BLOCK_MIN_CHARS = 1000  # Taille minimale avant de chercher une coupure
+NOTE_BLOCK_MAX_CHARS = 4000  # Coupure forcée au-delà de cette taille
+NOTE_BLOCK_CUT_MODULUS = 8   # Une fin de phrase sur 8 (en moyenne) termine un bloc
+
+
+# File d'attente des imports PDF (traités en arrière-plan)
+JOBS_FOLDER = os.path.join(DATA_FOLDER, "jobs")
+JOBS_DB = os.path.join(JOBS_FOLDER, "jobs.sqlite3")
+JOB_MAX_WORKERS = 2  # Processus dédiés à l'extraction
+JOB_HEARTBEAT_TIMEOUT = 120  # Secondes sans signe de vie avant qu'une tâche en cours soit reprise
+JOB_MAX_ATTEMPTS = 3  # Tentatives avant d'abandonner une tâche dont le processus s'arrête
+
+os.makedirs(JOBS_FOLDER, exist_ok=True)
+
+
+# Import en masse de dossiers (PDF et TXT)
+IMPORT_INDEX_PATH = os.path.join(DATA_FOLDER, "import_index.json")  # Empreintes des fichiers déjà importés
+IMPORT_REPORTS_FOLDER = os.path.join(DATA_FOLDER, "import_reports")
+
+os.makedirs(IMPORT_REPORTS_FOLDER, exist_ok=True)
+
+
+# Cache partagé du contenu des notes (toutes sessions confondues)
+NOTE_CACHE_MAX_CHARS = 50_000_000  # Taille maximale du cache, en caractères
+
+
+# Backend de découpage en phrases et en mots : "nltk" (punkt) ou "regex" (rapide).
+# "nltk" reste le défaut tant que benchmarks/bench_tokenizers.py n'a pas mesuré
+# la précision du backend regex sur un corpus de référence
+TOKENIZER_BACKEND = os.getenv("QUIZPREP_TOKENIZER", "nltk")
@@ -0,0 +1,258 @@
+"""
+Import en masse d'une arborescence de fichiers PDF et TXT.
+
+Les fichiers sont projetés en mémoire (mmap) plutôt que copiés, traités en
+parallèle par un pool de processus, et ignorés si leur contenu a déjà été
+importé. Un rapport JSON résume chaque import.
+
+Utilisation :
+    python -m utils.bulk_import chemin/vers/dossier [--workers N]
+"""
+
+import os
+import sys
+import json
+import mmap
+import time
+import hashlib
+import argparse
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from config import SUPPORTED_FILE_TYPES, IMPORT_INDEX_PATH, IMPORT_REPORTS_FOLDER
+
+# Empreintes déjà importées, transmises à chaque processus du pool
+_known_hashes = frozenset()
+
+# Suffixes numériques essayés avant de renoncer à trouver un titre libre
+MAX_TITLE_SUFFIX = 100
+
+def _init_worker(known_hashes):
+    global _known_hashes
+    _known_hashes = known_hashes
+
+def load_import_index():
+    """
+    Charge l'index des fichiers importés (empreinte SHA-256 -> informations)
+    """
+    try:
+        with open(IMPORT_INDEX_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def save_import_index(index):
+    with open(IMPORT_INDEX_PATH, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=4)
+
+def find_importable_files(root):
+    """
+    Liste les fichiers d'une arborescence dont l'extension est supportée
+
+    Args:
+        root (str): Dossier racine
+
+    Returns:
+        list: Chemins des fichiers, triés
+    """
+    extensions = tuple(f".{ext}" for ext in SUPPORTED_FILE_TYPES)
+    paths = []
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.lower().endswith(extensions):
+                paths.append(os.path.join(directory, filename))
+    return sorted(paths)
+
+def title_from_path(root, path):
+    """
+    Construit le titre d'une note à partir de son chemin relatif
+    (par exemple "S1/Réseaux/cours 1.pdf" -> "S1 - Réseaux - cours 1")
+    """
+    relative = os.path.splitext(os.path.relpath(path, root))[0]
+    return " - ".join(relative.split(os.sep))
+
+def unique_title(root, path, sources, claimed):
+    """
+    Choisit pour un fichier un titre dont le fichier de note n'est utilisé ni
+    par un autre fichier de l'import, ni par une note existante d'une autre
+    source ("cours 1.pdf", "cours 1.txt" et "cours_1.txt" donneraient sinon la
+    même note). En cas de conflit, l'extension est ajoutée au titre, puis un
+    numéro.
+
+    Args:
+        root (str): Dossier racine
+        path (str): Chemin du fichier à enregistrer
+        sources (dict): Fichier de note -> chemin du fichier importé qui l'a créé
+        claimed (set): Fichiers de note déjà écrits par cet import (complété ici)
+
+    Returns:
+        str: Le titre retenu, ou None si aucun titre libre n'a été trouvé
+    """
+    from utils.note_manager import note_path
+
+    source = os.path.abspath(path)
+    base = title_from_path(root, path)
+    extension = os.path.splitext(path)[1].lstrip(".").lower()
+    candidates = [base, f"{base} ({extension})"]
+    candidates += [f"{base} ({extension}) {number}" for number in range(2, MAX_TITLE_SUFFIX + 1)]
+
+    for title in candidates:
+        target = note_path(title)
+        if target in claimed:
+            continue
+        if os.path.exists(target) and sources.get(target) != source:
+            continue
+        claimed.add(target)
+        return title
+    return None
+
+def _decode_text(buffer):
+    try:
+        return str(buffer, "utf-8")
+    except UnicodeDecodeError:
+        # Fichiers enregistrés sous Windows
+        return str(buffer, "cp1252", errors="replace")
+
+def extract_file(path):
+    """
+    Extrait le texte d'un fichier PDF ou TXT via une projection mémoire.
+    Le fichier est ignoré si son empreinte figure déjà dans l'index.
+
+    Args:
+        path (str): Chemin du fichier
+
+    Returns:
+        dict: {"path", "hash", "status", "text", "error"} où status vaut
+              "extracted", "skipped" ou "failed"
+    """
+    # Import local : évite de charger PyPDF2 dans le processus principal
+    from utils.pdf_extractor import extract_text_from_pdf
+
+    result = {"path": path, "hash": None, "status": "failed", "text": "", "error": None}
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                result["error"] = "Fichier vide"
+                return result
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                result["hash"] = hashlib.sha256(mapped).hexdigest()
+                if result["hash"] in _known_hashes:
+                    result["status"] = "skipped"
+                    return result
+
+                if path.lower().endswith(".pdf"):
+                    text = extract_text_from_pdf(mapped)
+                else:
+                    text = _decode_text(mapped).replace("\r\n", "\n")
+
+        if not text.strip():
+            result["error"] = "Aucun texte extrait"
+            return result
+
+        result["status"] = "extracted"
+        result["text"] = text
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+def import_directory(root, max_workers=None):
+    """
+    Importe tous les fichiers PDF et TXT d'une arborescence comme notes,
+    puis écrit un rapport dans IMPORT_REPORTS_FOLDER
+
+    Args:
+        root (str): Dossier racine à importer
+        max_workers (int): Nombre de processus (par défaut, un par cœur)
+
+    Returns:
+        dict: Le rapport d'import
+    """
+    from utils.note_manager import save_note, note_path
+
+    start = time.perf_counter()
+    index = load_import_index()
+    paths = find_importable_files(root)
+    report = {
+        "root": os.path.abspath(root),
+        "started_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "files": len(paths),
+        "imported": [],
+        "skipped": [],
+        "failed": []
+    }
+
+    # Fichier source de chaque note déjà créée par un import, et notes écrites par celui-ci
+    sources = {note_path(info["title"]): info["path"] for info in index.values()}
+    claimed = set()
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(frozenset(index),)) as executor:
+            futures = [executor.submit(extract_file, path) for path in paths]
+            # Résultats traités dans l'ordre des chemins : les titres attribués
+            # en cas de conflit ne dépendent pas de l'ordre d'extraction
+            for path, future in zip(paths, futures):
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    # Un processus a été tué (mémoire, PDF malformé) : les fichiers
+                    # restants échouent aussi, un nouvel import les reprendra
+                    result = {"status": "failed",
+                              "error": "Processus d'extraction interrompu, relancez l'import"}
+                except Exception as e:
+                    result = {"status": "failed", "error": str(e)}
+
+                if result["status"] == "failed":
+                    report["failed"].append({"path": path, "error": result["error"]})
+                    continue
+                if result["status"] == "skipped" or result["hash"] in index:
+                    # Déjà importé, lors d'un import précédent ou plus tôt dans celui-ci
+                    report["skipped"].append({"path": path, "title": index[result["hash"]]["title"]})
+                    continue
+
+                title = unique_title(root, path, sources, claimed)
+                if title is None:
+                    # Pas de note enregistrée : l'empreinte n'est pas indexée
+                    report["failed"].append({"path": path, "error": f"Titre déjà utilisé par une autre note : "
+                                                                   f"{title_from_path(root, path)}"})
+                else:
+                    save_note(title, result["text"])
+                    index[result["hash"]] = {
+                        "title": title,
+                        "path": os.path.abspath(path),
+                        "imported_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    }
+                    entry = {"path": path, "title": title, "characters": len(result["text"])}
+                    if title != title_from_path(root, path):
+                        entry["renamed_from"] = title_from_path(root, path)
+                    report["imported"].append(entry)
+    finally:
+        save_import_index(index)
+
+    report["duration_s"] = round(time.perf_counter() - start, 3)
+    report_path = os.path.join(IMPORT_REPORTS_FOLDER, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=4)
+    report["report_path"] = report_path
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importe un dossier de fichiers PDF et TXT comme notes.")
+    parser.add_argument("root", help="Dossier à importer (parcouru récursivement)")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus d'extraction")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.root):
+        parser.error(f"Dossier introuvable : {args.root}")
+
+    report = import_directory(args.root, args.workers)
+    print(f"{len(report['imported'])} importé(s), {len(report['skipped'])} ignoré(s) (déjà importés), "
+          f"{len(report['failed'])} en erreur sur {report['files']} fichier(s) en {report['duration_s']} s")
+    for failure in report["failed"]:
+        print(f"  Erreur : {failure['path']} ({failure['error']})")
+    print(f"Rapport : {report['report_path']}")
+    return 1 if report["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+"""
+Analyse des concepts sur l'ensemble des notes (matrice termes-documents creuse, TF-IDF)
+"""
+
+import hashlib
+import threading
+import numpy as np
+from scipy import sparse
+from utils.text_processor import extract_terms, get_tokenizer
+from utils.note_manager import note_terms
+
+class CorpusIndex:
+    """
+    Matrice termes-documents creuse, mise à jour de façon incrémentale.
+
+    Chaque note est une ligne, chaque terme une colonne. Seules les notes dont
+    la version (ou le contenu, pour update) a changé sont relues et
+    re-tokenisées ; la matrice CSR est reconstruite à la demande par simple
+    concaténation des lignes.
+    """
+
+    def __init__(self):
+        self.vocabulary = {}  # terme -> indice de colonne
+        self.terms = []       # indice de colonne -> terme
+        self._rows = {}       # identifiant -> (clé de version et backend, colonnes, occurrences)
+        self._doc_ids = []
+        self._matrix = None
+        self._tfidf = None
+        self._lock = threading.RLock()
+        self._sync_thread = None
+        self._synced_state = None    # Notes et backend de la dernière synchronisation
+        self.ready = False           # Au moins une synchronisation terminée
+        self.sync_progress = (0, 0)  # (notes traitées, notes à traiter)
+
+    def __len__(self):
+        return len(self._rows)
+
+    @property
+    def doc_ids(self):
+        with self._lock:
+            self._build()
+            return list(self._doc_ids)
+
+    def _term_ids(self, terms):
+        ids = np.empty(len(terms), dtype=np.int64)
+        for i, term in enumerate(terms):
+            column = self.vocabulary.get(term)
+            if column is None:
+                column = len(self.terms)
+                self.vocabulary[term] = column
+                self.terms.append(term)
+            ids[i] = column
+        return ids
+
+    @staticmethod
+    def _digest(text):
+        # Les termes dépendent du backend de découpage : un changement de backend
+        # doit re-tokeniser les notes même si leur contenu est identique
+        key = f"{get_tokenizer().name}\0{text}"
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def update(self, doc_id, text):
+        """
+        Ajoute ou met à jour une note dans l'index
+
+        Args:
+            doc_id (str): Identifiant de la note (son titre)
+            text (str): Contenu de la note
+
+        Returns:
+            bool: True si la note a été (re)tokenisée, False si elle était à jour
+        """
+        digest = self._digest(text)
+        with self._lock:
+            if self._is_current(doc_id, digest):
+                return False
+            self._set_row(doc_id, digest, extract_terms(text))
+            return True
+
+    def _is_current(self, doc_id, digest):
+        current = self._rows.get(doc_id)
+        return current is not None and current[0] == digest
+
+    def _set_row(self, doc_id, digest, terms):
+        columns, counts = np.unique(self._term_ids(terms), return_counts=True)
+        self._rows[doc_id] = (digest, columns, counts.astype(np.float64))
+        self._matrix = None
+        self._tfidf = None
+
+    def remove(self, doc_id):
+        """
+        Retire une note de l'index (sans effet si elle est absente)
+        """
+        with self._lock:
+            if self._rows.pop(doc_id, None) is not None:
+                self._matrix = None
+                self._tfidf = None
+
+    @staticmethod
+    def _handle_key(handle):
+        return (get_tokenizer().name, handle.version)
+
+    @staticmethod
+    def _sync_state(handles):
+        return get_tokenizer().name, frozenset((handle.id, handle.version) for handle in handles)
+
+    def sync(self, handles):
+        """
+        Aligne l'index sur une liste de notes : ajoute les nouvelles,
+        re-tokenise les modifiées et retire les supprimées. Seules les notes
+        dont la version a changé sont lues (sans passer par le cache partagé)
+        et, pour les notes stockées en blocs, seuls les blocs modifiés sont
+        re-tokenisés.
+
+        Args:
+            handles (list): NoteHandle tels que retournés par list_note_handles
+
+        Returns:
+            int: Le nombre de notes (re)tokenisées
+        """
+        with self._lock:
+            stale = [handle for handle in handles
+                     if not self._is_current(handle.id, self._handle_key(handle))]
+            for doc_id in set(self._rows) - {handle.id for handle in handles}:
+                self.remove(doc_id)
+            self.sync_progress = (0, len(stale))
+
+        # La lecture et la tokenisation se font hors du verrou : l'index reste consultable
+        for position, handle in enumerate(stale, start=1):
+            terms = note_terms(handle.load(cache=False))
+            with self._lock:
+                self._set_row(handle.id, self._handle_key(handle), terms)
+                self.sync_progress = (position, len(stale))
+        return len(stale)
+
+    @property
+    def syncing(self):
+        return self._sync_thread is not None and self._sync_thread.is_alive()
+
+    def start_sync(self, handles):
+        """
+        Lance sync dans un thread en arrière-plan, sauf si une synchronisation
+        est déjà en cours ou si les notes n'ont pas changé depuis la dernière.
+        Les résultats restent consultables pendant ce temps ; ready passe à
+        True à la fin de la première synchronisation.
+
+        Args:
+            handles (list): NoteHandle tels que retournés par list_note_handles
+
+        Returns:
+            bool: True si une synchronisation a été lancée
+        """
+        state = self._sync_state(handles)
+        with self._lock:
+            if self.syncing or state == self._synced_state:
+                return False
+            self._sync_thread = threading.Thread(target=self._sync_from, args=(handles, state),
+                                                 name="quizprep-corpus-sync", daemon=True)
+            self._sync_thread.start()
+            return True
+
+    def _sync_from(self, handles, state):
+        try:
+            self.sync(handles)
+            self._synced_state = state
+        except Exception as e:
+            print(f"Erreur lors de l'analyse des concepts: {str(e)}")
+        finally:
+            self.ready = True
+
+    def _build(self):
+        if self._matrix is not None:
+            return
+        self._doc_ids = list(self._rows)
+        rows = [self._rows[doc_id] for doc_id in self._doc_ids]
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        if rows:
+            np.cumsum([len(columns) for _, columns, _ in rows], out=indptr[1:])
+            indices = np.concatenate([columns for _, columns, _ in rows])
+            data = np.concatenate([counts for _, _, counts in rows])
+        else:
+            indices = np.empty(0, dtype=np.int64)
+            data = np.empty(0, dtype=np.float64)
+        self._matrix = sparse.csr_matrix((data, indices, indptr),
+                                         shape=(len(rows), len(self.terms)))
+
+    @property
+    def matrix(self):
+        """
+        Matrice CSR (notes x termes) des occurrences
+        """
+        with self._lock:
+            self._build()
+            return self._matrix
+
+    def tfidf(self):
+        """
+        Calcule la matrice TF-IDF (idf lissé, lignes normalisées L2)
+
+        Returns:
+            scipy.sparse.csr_matrix: Matrice (notes x termes)
+        """
+        with self._lock:
+            if self._tfidf is not None:
+                return self._tfidf
+            counts = self.matrix
+            num_docs = counts.shape[0]
+            doc_freq = np.bincount(counts.indices, minlength=counts.shape[1])
+            idf = np.log((1 + num_docs) / (1 + doc_freq)) + 1
+
+            weights = counts.copy()
+            weights.data *= idf[weights.indices]
+            row_norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+            row_norms[row_norms == 0] = 1
+            weights.data /= np.repeat(row_norms, np.diff(weights.indptr))
+            self._tfidf = weights
+            return weights
+
+    def key_concepts(self, num_concepts=10):
+        """
+        Extrait les concepts clés de chaque note selon leur poids TF-IDF
+
+        Args:
+            num_concepts (int): Le nombre de concepts par note
+
+        Returns:
+            dict: Identifiant de note -> liste de tuples (concept, poids)
+        """
+        with self._lock:
+            weights = self.tfidf()
+            doc_ids = list(self._doc_ids)
+        row_of_entry = np.repeat(np.arange(weights.shape[0]), np.diff(weights.indptr))
+
+        # Tri global par note puis par poids décroissant, sans boucle par note :
+        # les poids sont dans ]0, 1], la clé (ligne - poids) reste donc groupée par ligne
+        order = np.argsort(row_of_entry - weights.data)
+        rank = np.arange(len(order)) - weights.indptr[row_of_entry[order]]
+        keep = order[rank < num_concepts]
+
+        concepts = {doc_id: [] for doc_id in doc_ids}
+        for row, column, weight in zip(row_of_entry[keep], weights.indices[keep], weights.data[keep]):
+            concepts[doc_ids[row]].append((self.terms[column], float(weight)))
+        return concepts
+
+    def corpus_concepts(self, num_concepts=20):
+        """
+        Extrait les concepts clés de l'ensemble du corpus (somme des poids TF-IDF)
+
+        Args:
+            num_concepts (int): Le nombre de concepts à extraire
+
+        Returns:
+            list: Liste de tuples (concept, poids cumulé)
+        """
+        totals = np.asarray(self.tfidf().sum(axis=0)).ravel()
+        if not totals.size:
+            return []
+        num_concepts = min(num_concepts, totals.size)
+        top = np.argpartition(-totals, num_concepts - 1)[:num_concepts]
+        top = top[np.argsort(-totals[top])]
+        return [(self.terms[column], float(totals[column])) for column in top]
+
+    def weakest_concepts(self, quiz_history, num_concepts=10, min_questions=2):
+        """
+        Identifie les concepts les moins maîtrisés en croisant les questions
+        de l'historique des quiz avec le vocabulaire du corpus
+
+        Args:
+            quiz_history (list): Historique tel que retourné par load_quiz_history
+            num_concepts (int): Le nombre de concepts à retourner
+            min_questions (int): Nombre minimal de questions évaluées par concept
+
+        Returns:
+            list: Liste de tuples (concept, score moyen, nombre de questions),
+                  du plus faible au plus fort
+        """
+        with self._lock:
+            self._build()
+            indptr = [0]
+            indices = []
+            scores = []
+            for quiz in quiz_history:
+                for question, score in zip(quiz.get("questions", []), quiz.get("scores", [])):
+                    columns = {self.vocabulary[t] for t in extract_terms(question) if t in self.vocabulary}
+                    indices.extend(columns)
+                    indptr.append(len(indices))
+                    scores.append(score)
+            num_terms = len(self.terms)
+
+        if not scores:
+            return []
+
+        # Matrice binaire (questions x termes) : un produit matriciel agrège tous les scores
+        questions = sparse.csr_matrix((np.ones(len(indices)), indices, indptr),
+                                      shape=(len(scores), num_terms))
+        totals = questions.T @ np.asarray(scores, dtype=np.float64)
+        counts = questions.T @ np.ones(len(scores))
+
+        eligible = np.flatnonzero(counts >= min_questions)
+        means = totals[eligible] / counts[eligible]
+        order = eligible[np.argsort(means, kind="stable")][:num_concepts]
+        return [(self.terms[column], float(totals[column] / counts[column]), int(counts[column]))
+                for column in order]
@@ -8,7 +8,14 @@ import json
 import os
 import sys
 import time
-from config import OPENROUTER_API_KEY, OPENROUTER_API_URL, DEEPSEEK_MODEL, API_CONFIG
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from config import (OPENROUTER_API_KEY, OPENROUTER_API_URL, DEEPSEEK_MODEL, API_CONFIG,
+                    GRADING_CACHE_FOLDER, GRADING_MAX_WORKERS)
+
+# Pool partagé pour exécuter les corrections hors du thread de l'interface
+_grading_executor = ThreadPoolExecutor(max_workers=GRADING_MAX_WORKERS,
+                                       thread_name_prefix="quizprep-grading")
 
 def call_deepseek_api(prompt, system_prompt=""):
     """
@@ -176,4 +183,171 @@ def parse_questions_from_response(response, expected_count):
         chunks = re.split(r'\n\s*\n', response)
         questions = [chunk.strip() for chunk in chunks if chunk.strip()]
     
-    return questions
\ No newline at end of file
+    return questions
+
+def _grading_cache_key(question, answer, passages):
+    """
+    Calcule la clé de cache d'une réponse (hash de la question, de la réponse
+    et des passages de référence)
+    """
+    payload = json.dumps([question, answer, passages], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _load_cached_grade(key):
+    path = os.path.join(GRADING_CACHE_FOLDER, f"{key}.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _save_cached_grade(key, grade):
+    path = os.path.join(GRADING_CACHE_FOLDER, f"{key}.json")
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(grade, f, ensure_ascii=False, indent=4)
+    except OSError as e:
+        # Le cache est facultatif : la correction obtenue reste valable
+        print(f"Erreur lors de l'écriture du cache de correction: {str(e)}")
+
+def grade_answers(items):
+    """
+    Corrige un lot de réponses en un seul appel à l'API Deepseek.
+    Les réponses déjà corrigées (même hash) sont lues depuis le cache et
+    ne sont pas renvoyées à l'API.
+    
+    Args:
+        items (list): Liste de dictionnaires {"question", "answer", "passages"}
+        
+    Returns:
+        list: Pour chaque élément, un dictionnaire {"score": int, "feedback": str}
+              ou None si la correction n'a pas pu être obtenue
+    """
+    grades = [None] * len(items)
+    keys = [_grading_cache_key(item["question"], item["answer"], item.get("passages", []))
+            for item in items]
+    
+    pending = []
+    for i, key in enumerate(keys):
+        # Une réponse vide vaut 0, inutile de la soumettre
+        if not items[i]["answer"].strip():
+            grades[i] = {"score": 0, "feedback": "Aucune réponse fournie."}
+            continue
+        cached = _load_cached_grade(key)
+        if cached is not None:
+            grades[i] = cached
+        else:
+            pending.append(i)
+    
+    if not pending:
+        return grades
+    
+    system_prompt = """
+    Vous êtes un correcteur bienveillant et rigoureux.
+    Pour chaque question, évaluez la réponse de l'étudiant à l'aide des extraits de notes fournis.
+    
+    Consignes:
+    1. Attribuez un score entier de 0 (faux ou absent) à 5 (complet et précis)
+    2. Valorisez la compréhension des concepts clés plutôt que la formulation exacte
+    3. Rédigez un retour court (une ou deux phrases) en français
+    4. Retournez uniquement un tableau JSON de la forme
+       [{"id": 1, "score": 4, "feedback": "..."}], sans autre texte
+    """
+    
+    blocks = []
+    for position, i in enumerate(pending, start=1):
+        item = items[i]
+        passages = "\n".join(f"- {p}" for p in item.get("passages", [])) or "- (aucun extrait)"
+        blocks.append(
+            f"### id {position}\n"
+            f"Question: {item['question']}\n"
+            f"Extraits des notes:\n{passages}\n"
+            f"Réponse de l'étudiant: {item['answer']}"
+        )
+    prompt = "Corrigez les réponses suivantes:\n\n" + "\n\n".join(blocks)
+    
+    try:
+        response = call_deepseek_api(prompt, system_prompt)
+        parsed = parse_grades_from_response(response, len(pending))
+    except Exception as e:
+        print(f"Erreur lors de la correction automatique: {str(e)}")
+        return grades
+    
+    for position, i in enumerate(pending):
+        grade = parsed[position]
+        if grade is not None:
+            grades[i] = grade
+            _save_cached_grade(keys[i], grade)
+    
+    return grades
+
+def grade_answers_async(items, callback=None):
+    """
+    Lance grade_answers dans le pool de correction et retourne immédiatement
+    
+    Args:
+        items (list): Voir grade_answers
+        callback (callable): Appelée dans le thread de correction avec la liste
+                             des corrections, ou None si la correction a échoué.
+                             Elle s'exécute même si la session qui l'a lancée a disparu.
+        
+    Returns:
+        concurrent.futures.Future: Résultat différé de grade_answers
+    """
+    future = _grading_executor.submit(grade_answers, items)
+    if callback is not None:
+        def _on_done(done_future):
+            try:
+                grades = done_future.result()
+            except Exception as e:
+                print(f"Erreur lors de la correction automatique: {str(e)}")
+                grades = None
+            callback(grades)
+        future.add_done_callback(_on_done)
+    return future
+
+def parse_grades_from_response(response, expected_count):
+    """
+    Parse la réponse de l'API pour extraire les scores et retours
+    
+    Args:
+        response (str): La réponse brute de l'API
+        expected_count (int): Le nombre de corrections attendu
+        
+    Returns:
+        list: Liste de longueur expected_count contenant des dictionnaires
+              {"score": int, "feedback": str} ou None pour les entrées manquantes
+    """
+    grades = [None] * expected_count
+    
+    # Le modèle peut entourer le JSON de texte, de raisonnement (<think>) ou de
+    # balises (\boxed{}, ```json) : on essaie de décoder à partir de chaque "["
+    # et on garde le dernier tableau d'objets valide
+    decoder = json.JSONDecoder()
+    entries = None
+    for match in re.finditer(r'\[', response):
+        try:
+            candidate, _ = decoder.raw_decode(response, match.start())
+        except ValueError:
+            continue
+        if isinstance(candidate, list) and candidate and all(isinstance(e, dict) for e in candidate):
+            entries = candidate
+    
+    if entries is None:
+        return grades
+    
+    for position, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            continue
+        try:
+            index = int(entry.get("id", position + 1)) - 1
+            score = int(round(float(entry["score"])))
+        except (KeyError, TypeError, ValueError):
+            continue
+        if 0 <= index < expected_count:
+            grades[index] = {
+                "score": max(0, min(5, score)),
+                "feedback": str(entry.get("feedback", "")).strip()
+            }
+    
+    return grades
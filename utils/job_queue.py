@@ -0,0 +1,269 @@
+"""
+File d'attente locale pour les imports PDF : les extractions tournent dans
+un pool de processus, leur état est conservé dans une petite base SQLite
+pour suivre la progression page par page et reprendre après un redémarrage
+"""
+
+import os
+import time
+import uuid
+import shutil
+import sqlite3
+import threading
+import functools
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from config import JOBS_FOLDER, JOBS_DB, JOB_MAX_WORKERS, JOB_HEARTBEAT_TIMEOUT, JOB_MAX_ATTEMPTS
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    source_path TEXT NOT NULL,
+    status TEXT NOT NULL,
+    pages_done INTEGER NOT NULL DEFAULT 0,
+    total_pages INTEGER,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    owner TEXT,
+    heartbeat_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+# Statuts d'une tâche
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+def _connect(db_path):
+    connection = sqlite3.connect(db_path, timeout=30)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA journal_mode=WAL")
+    return connection
+
+def _update_job(db_path, job_id, **fields):
+    fields["updated_at"] = _now()
+    assignments = ", ".join(f"{name} = ?" for name in fields)
+    with _connect(db_path) as connection:
+        connection.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+def _pages_folder(job_id):
+    return os.path.join(JOBS_FOLDER, job_id)
+
+def _remove_job_files(job_id, source_path):
+    shutil.rmtree(_pages_folder(job_id), ignore_errors=True)
+    try:
+        os.remove(source_path)
+    except FileNotFoundError:
+        pass
+
+def _claim_job(db_path, job_id, owner):
+    """
+    Réserve une tâche de façon atomique : une tâche en attente, ou en cours
+    mais sans signe de vie depuis JOB_HEARTBEAT_TIMEOUT secondes
+
+    Returns:
+        bool: True si la tâche a été réservée par owner
+    """
+    now = time.time()
+    with _connect(db_path) as connection:
+        cursor = connection.execute(
+            "UPDATE jobs SET status = ?, owner = ?, heartbeat_at = ?, "
+            "updated_at = ? WHERE id = ? AND (status = ? OR (status = ? AND "
+            "(heartbeat_at IS NULL OR heartbeat_at < ?)))",
+            (RUNNING, owner, now, _now(), job_id, QUEUED, RUNNING, now - JOB_HEARTBEAT_TIMEOUT)
+        )
+    return cursor.rowcount == 1
+
+def run_pdf_import(db_path, job_id, owner):
+    """
+    Exécute une tâche d'import dans un processus du pool : extrait les pages
+    restantes (chaque page est écrite sur disque avant d'être comptée),
+    puis enregistre la note
+
+    Args:
+        db_path (str): Chemin de la base des tâches
+        job_id (str): Identifiant de la tâche
+        owner (str): Identifiant de la file qui exécute la tâche
+    """
+    # Imports locaux : seuls les processus du pool en ont besoin
+    from utils.pdf_extractor import iter_pdf_pages, clean_pdf_text
+    from utils.note_manager import save_note
+
+    # Tâche terminée, ou déjà prise en charge par une autre file encore active
+    if not _claim_job(db_path, job_id, owner):
+        return
+
+    with _connect(db_path) as connection:
+        job = connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+    pages_folder = _pages_folder(job_id)
+    os.makedirs(pages_folder, exist_ok=True)
+
+    try:
+        total_pages = job["total_pages"] or 0
+        for page_num, total_pages, page_text in iter_pdf_pages(job["source_path"], job["pages_done"]):
+            with open(os.path.join(pages_folder, f"{page_num}.txt"), "w", encoding="utf-8") as f:
+                f.write(page_text)
+            _update_job(db_path, job_id, pages_done=page_num + 1, total_pages=total_pages,
+                        heartbeat_at=time.time())
+
+        page_texts = []
+        for page_num in range(total_pages):
+            with open(os.path.join(pages_folder, f"{page_num}.txt"), "r", encoding="utf-8") as f:
+                page_texts.append(f.read())
+        text_content = clean_pdf_text("".join(page_text + "\n\n" for page_text in page_texts))
+
+        if not text_content:
+            raise ValueError("Le PDF ne contient pas de texte extractible.")
+
+        save_note(job["title"], text_content)
+        _update_job(db_path, job_id, status=DONE, total_pages=total_pages)
+
+    except Exception as e:
+        _update_job(db_path, job_id, status=FAILED, error=str(e))
+
+    # Nettoyer les fichiers temporaires de la tâche (une tâche échouée n'est pas reprise)
+    _remove_job_files(job_id, job["source_path"])
+
+class JobQueue:
+    """
+    File d'attente des imports PDF, partagée par toutes les sessions du serveur.
+    Les tâches inachevées lors d'un arrêt sont relancées à la création de la file ;
+    une tâche en cours dans une autre file encore active n'est pas exécutée deux fois.
+    """
+
+    def __init__(self, db_path=JOBS_DB, max_workers=JOB_MAX_WORKERS):
+        self.db_path = db_path
+        self.max_workers = max_workers
+        self.owner = uuid.uuid4().hex
+        with _connect(db_path) as connection:
+            connection.execute(_SCHEMA)
+        self._lock = threading.Lock()
+        self._futures = {}
+        self._executor = self._create_executor()
+        self.resume_pending()
+
+    def _create_executor(self):
+        # "spawn" évite de dupliquer les threads du serveur Streamlit dans les processus
+        return ProcessPoolExecutor(max_workers=self.max_workers,
+                                   mp_context=multiprocessing.get_context("spawn"))
+
+    def _submit(self, job_id):
+        with self._lock:
+            if job_id in self._futures:
+                return
+            try:
+                executor = self._executor
+                future = executor.submit(run_pdf_import, self.db_path, job_id, self.owner)
+            except BrokenProcessPool:
+                # Pool déjà cassé : le recréer avant de soumettre
+                executor = self._executor = self._create_executor()
+                future = executor.submit(run_pdf_import, self.db_path, job_id, self.owner)
+            self._futures[job_id] = future
+        future.add_done_callback(functools.partial(self._on_done, job_id, executor))
+
+    def _on_done(self, job_id, executor, future):
+        with self._lock:
+            self._futures.pop(job_id, None)
+        error = future.exception()
+        if error is None:
+            return
+
+        with _connect(self.db_path) as connection:
+            job = connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if job is None or job["status"] in (DONE, FAILED):
+            return
+        if job["status"] == RUNNING and job["owner"] != self.owner:
+            # Tâche reprise entre-temps par une autre file
+            return
+
+        if isinstance(error, BrokenProcessPool):
+            # Les tentatives sont comptées ici et non par le processus : un processus
+            # qui s'arrête avant d'avoir réservé la tâche compte aussi
+            attempts = job["attempts"] + 1
+            if attempts < JOB_MAX_ATTEMPTS:
+                # Un processus a été tué (mémoire, signal) : recréer le pool une seule
+                # fois pour toutes les tâches touchées, puis relancer celle-ci
+                _update_job(self.db_path, job_id, status=QUEUED, attempts=attempts)
+                with self._lock:
+                    if self._executor is executor:
+                        self._executor = self._create_executor()
+                self._submit(job_id)
+                return
+            message = f"Le processus d'extraction s'est arrêté de façon inattendue ({attempts} tentatives)."
+            _update_job(self.db_path, job_id, status=FAILED, attempts=attempts, error=message)
+        else:
+            _update_job(self.db_path, job_id, status=FAILED, error=str(error))
+        _remove_job_files(job_id, job["source_path"])
+
+    def resume_pending(self):
+        """
+        Relance les tâches en attente et celles interrompues (en cours, mais sans
+        signe de vie depuis JOB_HEARTBEAT_TIMEOUT secondes). Les tâches déjà
+        soumises par cette file sont ignorées.
+
+        Returns:
+            int: Le nombre de tâches relancées
+        """
+        with _connect(self.db_path) as connection:
+            rows = connection.execute(
+                "SELECT id FROM jobs WHERE status = ? OR (status = ? AND "
+                "(heartbeat_at IS NULL OR heartbeat_at < ?)) ORDER BY created_at",
+                (QUEUED, RUNNING, time.time() - JOB_HEARTBEAT_TIMEOUT)
+            ).fetchall()
+        with self._lock:
+            job_ids = [row["id"] for row in rows if row["id"] not in self._futures]
+        for job_id in job_ids:
+            self._submit(job_id)
+        return len(job_ids)
+
+    def enqueue_pdf_import(self, title, pdf_file):
+        """
+        Ajoute un import PDF à la file et retourne immédiatement
+
+        Args:
+            title (str): Titre de la note à créer
+            pdf_file: Objet fichier binaire (par exemple chargé via st.file_uploader)
+
+        Returns:
+            str: Identifiant de la tâche
+        """
+        job_id = uuid.uuid4().hex
+        source_path = os.path.join(JOBS_FOLDER, f"{job_id}.pdf")
+        pdf_file.seek(0)
+        with open(source_path, "wb") as f:
+            shutil.copyfileobj(pdf_file, f)
+
+        now = _now()
+        with _connect(self.db_path) as connection:
+            connection.execute(
+                "INSERT INTO jobs (id, title, source_path, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, title, source_path, QUEUED, now, now)
+            )
+        self._submit(job_id)
+        return job_id
+
+    def list_jobs(self, limit=10):
+        """
+        Retourne les tâches les plus récentes
+
+        Args:
+            limit (int): Le nombre maximum de tâches
+
+        Returns:
+            list: Liste de dictionnaires (colonnes de la table jobs)
+        """
+        with _connect(self.db_path) as connection:
+            rows = connection.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?",
+                                      (limit,)).fetchall()
+        return [dict(row) for row in rows]
@@ -0,0 +1,335 @@
+"""
+Gestion des notes : stockage en blocs adressés par leur contenu et
+données dérivées (tokenisation, concepts) calculées bloc par bloc
+"""
+
+import os
+import re
+import json
+import zlib
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from config import (NOTES_FOLDER, DERIVED_FOLDER, NOTE_BLOCK_MIN_CHARS,
+                    NOTE_BLOCK_MAX_CHARS, NOTE_BLOCK_CUT_MODULUS, NOTE_CACHE_MAX_CHARS)
+from utils.text_processor import extract_terms, get_tokenizer
+
+# Coupures possibles : paragraphe, fin de phrase ou fin de ligne
+_BOUNDARY_PATTERN = re.compile(r'\n\s*\n|[.!?…]["»)\]]*\s+|\n')
+
+def note_path(title):
+    """
+    Retourne le chemin du fichier JSON d'une note
+    """
+    return os.path.join(NOTES_FOLDER, f"{title.replace(' ', '_')}.json")
+
+def block_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+def split_into_blocks(content):
+    """
+    Découpe le contenu d'une note en blocs dont la concaténation redonne
+    exactement le contenu. Les coupures dépendent du texte local (paragraphes,
+    empreinte des fins de phrase) : une modification ne change donc que les
+    blocs qui l'entourent.
+
+    Args:
+        content (str): Le contenu de la note
+
+    Returns:
+        list: Liste de dictionnaires {"hash", "text"}
+    """
+    texts = []
+    start = 0
+    segment_start = 0
+
+    for match in _BOUNDARY_PATTERN.finditer(content):
+        end = match.end()
+        segment = content[segment_start:end]
+        segment_start = end
+
+        length = end - start
+        if length < NOTE_BLOCK_MIN_CHARS:
+            continue
+
+        if (match.group().count('\n') >= 2 or
+                length >= NOTE_BLOCK_MAX_CHARS or
+                zlib.crc32(segment.encode("utf-8")) % NOTE_BLOCK_CUT_MODULUS == 0):
+            texts.append(content[start:end])
+            start = end
+
+    if start < len(content):
+        texts.append(content[start:])
+
+    return [{"hash": block_hash(text), "text": text} for text in texts]
+
+def note_content(note):
+    """
+    Reconstitue le contenu d'une note (format en blocs ou ancien format)
+    """
+    if "blocks" in note:
+        return "".join(block["text"] for block in note["blocks"])
+    return note.get("content", "")
+
+def save_note(title, content):
+    """
+    Enregistre une note sous forme de blocs ; la date de création est conservée.
+    Les données dérivées des blocs retirés ne sont pas supprimées ici (un même
+    bloc peut appartenir à plusieurs notes) : voir remove_unused_artifacts.
+
+    Args:
+        title (str): Titre de la note
+        content (str): Contenu de la note
+
+    Returns:
+        str: Chemin du fichier enregistré
+    """
+    filename = note_path(title)
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    previous = None
+    if os.path.exists(filename):
+        with open(filename, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+
+    blocks = split_into_blocks(content)
+    data = {
+        "title": title,
+        "created_at": previous.get("created_at", now) if previous else now,
+        "updated_at": now,
+        "version": previous.get("version", 0) + 1 if previous else 1,
+        "blocks": blocks
+    }
+
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+
+    return filename
+
+class _NoteCache:
+    """
+    Cache LRU des notes chargées, borné par le nombre total de caractères
+    et partagé par toutes les sessions du processus. Les notes en cache ne
+    gardent que leur contenu : les blocs y sont des positions dans ce contenu
+    (voir _read_note), la taille comptée est donc celle réellement occupée.
+    """
+
+    def __init__(self, max_chars):
+        self.max_chars = max_chars
+        self.size = 0
+        self._entries = OrderedDict()  # (identifiant, version) -> note
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            note = self._entries.get(key)
+            if note is not None:
+                self._entries.move_to_end(key)
+            return note
+
+    def put(self, key, note):
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = note
+            self.size += len(note["content"])
+            while self.size > self.max_chars and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted["content"])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+_note_cache = _NoteCache(NOTE_CACHE_MAX_CHARS)
+
+# Titres connus par identifiant : {identifiant: (version, titre)}
+_titles = {}
+
+class NoteHandle:
+    """
+    Référence légère vers une note, à conserver dans l'état de session à la
+    place de la note complète. Le contenu est lu à la demande via le cache partagé.
+
+    Attributes:
+        id (str): Nom du fichier de la note, sans extension
+        title (str): Titre de la note
+        version (int): Date de modification du fichier (ns), change à chaque enregistrement
+    """
+
+    __slots__ = ("id", "title", "version")
+
+    def __init__(self, note_id, title, version):
+        self.id = note_id
+        self.title = title
+        self.version = version
+
+    def __repr__(self):
+        return f"NoteHandle({self.id!r}, {self.title!r}, {self.version})"
+
+    def __eq__(self, other):
+        return (isinstance(other, NoteHandle) and
+                (self.id, self.version) == (other.id, other.version))
+
+    def __hash__(self):
+        return hash((self.id, self.version))
+
+    def load(self, cache=True):
+        """
+        Retourne la note complète (dictionnaire partagé, à ne pas modifier)
+
+        Args:
+            cache (bool): False pour un parcours ponctuel de nombreuses notes :
+                          une note absente du cache est lue sans y être ajoutée,
+                          ce qui n'évince pas les notes ouvertes par les sessions
+        """
+        return _load_note(self.id, self.version, cache)
+
+    @property
+    def content(self):
+        return self.load()["content"]
+
+def _read_note(note_id, cache=True):
+    path = os.path.join(NOTES_FOLDER, f"{note_id}.json")
+    with open(path, "r", encoding="utf-8") as f:
+        version = os.fstat(f.fileno()).st_mtime_ns
+        note = json.load(f)
+    note["content"] = note_content(note)
+    if "blocks" in note:
+        # Ne garder qu'une copie du texte : chaque bloc devient (empreinte, début, fin)
+        spans = []
+        start = 0
+        for block in note.pop("blocks"):
+            spans.append((block["hash"], start, start + len(block["text"])))
+            start += len(block["text"])
+        note["block_spans"] = spans
+    if cache:
+        _note_cache.put((note_id, version), note)
+    _titles[note_id] = (version, note["title"])
+    return version, note
+
+def _load_note(note_id, version, cache=True):
+    note = _note_cache.get((note_id, version))
+    if note is None:
+        # Absente du cache ou modifiée depuis : relire la version courante
+        _, note = _read_note(note_id, cache)
+    return note
+
+def list_note_handles():
+    """
+    Liste les notes sous forme de références légères, triées par titre.
+    Seuls les fichiers nouveaux ou modifiés sont relus.
+
+    Returns:
+        list: Liste de NoteHandle
+    """
+    handles = []
+    with os.scandir(NOTES_FOLDER) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".json"):
+                continue
+            note_id = entry.name[:-len(".json")]
+            version = entry.stat().st_mtime_ns
+            known = _titles.get(note_id)
+            if known is None or known[0] != version:
+                version, note = _read_note(note_id)
+                known = (version, note["title"])
+            handles.append(NoteHandle(note_id, known[1], version))
+    return sorted(handles, key=lambda handle: handle.title)
+
+def load_notes():
+    """
+    Charge toutes les notes, avec leur contenu reconstitué dans "content"
+    (les notes déjà en cache ne sont pas relues)
+    """
+    return [handle.load() for handle in list_note_handles()]
+
+def _derived_path(block_id):
+    return os.path.join(DERIVED_FOLDER, f"{block_id}.json")
+
+def invalidate_block(block_id):
+    """
+    Supprime les données dérivées d'un bloc (sans effet si absentes)
+    """
+    try:
+        os.remove(_derived_path(block_id))
+    except FileNotFoundError:
+        pass
+
+def remove_unused_artifacts():
+    """
+    Supprime les données dérivées des blocs qui n'appartiennent plus à aucune
+    note enregistrée. Un bloc supprimé par erreur (note enregistrée pendant le
+    parcours) est simplement recalculé au prochain accès.
+
+    Returns:
+        int: Le nombre de fichiers supprimés
+    """
+    referenced = set()
+    with os.scandir(NOTES_FOLDER) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                with open(entry.path, "r", encoding="utf-8") as f:
+                    note = json.load(f)
+            except (OSError, ValueError):
+                # Note illisible : ne rien supprimer plutôt que de perdre ses blocs
+                return 0
+            referenced.update(block["hash"] for block in note.get("blocks", []))
+
+    removed = 0
+    with os.scandir(DERIVED_FOLDER) as entries:
+        for entry in entries:
+            if entry.name.endswith(".json") and entry.name[:-len(".json")] not in referenced:
+                invalidate_block(entry.name[:-len(".json")])
+                removed += 1
+    return removed
+
+def get_block_artifacts(block):
+    """
+    Retourne les données dérivées d'un bloc, calculées au premier accès puis
+    lues depuis le cache disque
+
+    Args:
+        block (dict): Bloc {"hash", "text"}
+
+    Returns:
+        dict: {"tokenizer": backend utilisé, "terms": liste des termes significatifs du bloc}
+    """
+    path = _derived_path(block["hash"])
+    tokenizer = get_tokenizer().name
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            artifacts = json.load(f)
+        # Les termes dépendent du backend de découpage : recalculer s'il a changé
+        if artifacts.get("tokenizer") == tokenizer:
+            return artifacts
+    except (OSError, ValueError):
+        pass
+
+    artifacts = {"tokenizer": tokenizer, "terms": extract_terms(block["text"])}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(artifacts, f, ensure_ascii=False)
+    return artifacts
+
+def note_terms(note):
+    """
+    Retourne les termes significatifs d'une note, assemblés à partir des blocs
+
+    Args:
+        note (dict): Note telle que retournée par load_notes
+
+    Returns:
+        list: Liste des termes, dans l'ordre du texte
+    """
+    if "block_spans" not in note:
+        return extract_terms(note["content"])
+
+    terms = []
+    for block_id, start, end in note["block_spans"]:
+        block = {"hash": block_id, "text": note["content"][start:end]}
+        terms.extend(get_block_artifacts(block)["terms"])
+    return terms
@@ -8,42 +8,59 @@ import PyPDF2
 from PIL import Image
 import pytesseract
 
+def iter_pdf_pages(pdf_source, start_page=0):
+    """
+    Extrait le texte d'un PDF page par page, pour suivre la progression
+    ou reprendre une extraction interrompue.
+    
+    Args:
+        pdf_source: Chemin du fichier ou objet fichier binaire
+        start_page (int): Indice de la première page à extraire
+        
+    Yields:
+        tuple: (indice de la page, nombre total de pages, texte de la page)
+    """
+    pdf_reader = PyPDF2.PdfReader(pdf_source)
+    num_pages = len(pdf_reader.pages)
+    
+    for page_num in range(start_page, num_pages):
+        page = pdf_reader.pages[page_num]
+        page_text = page.extract_text() or ""
+        
+        # Si peu ou pas de texte est extrait, c'est peut-être une image
+        if len(page_text.strip()) < 50:
+            # TODO: Implémenter l'OCR si nécessaire
+            # Cette partie nécessite l'installation de Tesseract OCR
+            pass
+        
+        yield page_num, num_pages, page_text
+
 def extract_text_from_pdf(pdf_file):
     """
     Extrait le texte d'un fichier PDF, qu'il s'agisse de texte sélectionnable
     ou d'images contenant du texte (OCR).
     
     Args:
-        pdf_file: Objet fichier chargé via st.file_uploader
+        pdf_file: Objet fichier chargé via st.file_uploader, fichier ouvert
+                  ou fichier projeté en mémoire (mmap)
         
     Returns:
         str: Le texte extrait du PDF
     """
-    # Convertir en objet BytesIO pour PyPDF2
-    pdf_bytes = io.BytesIO(pdf_file.read())
+    if hasattr(pdf_file, "seek"):
+        # Les objets positionnables sont lus directement, sans copie
+        pdf_source = pdf_file
+    else:
+        # Sinon, convertir en objet BytesIO pour PyPDF2
+        pdf_source = io.BytesIO(pdf_file.read())
     
     # Réinitialiser le pointeur du fichier (important)
-    pdf_bytes.seek(0)
-    
-    extracted_text = ""
+    pdf_source.seek(0)
     
     try:
-        # Ouvrir le PDF avec PyPDF2
-        pdf_reader = PyPDF2.PdfReader(pdf_bytes)
-        num_pages = len(pdf_reader.pages)
-        
         # Parcourir chaque page
-        for page_num in range(num_pages):
-            page = pdf_reader.pages[page_num]
-            page_text = page.extract_text() or ""
-            
-            # Si peu ou pas de texte est extrait, c'est peut-être une image
-            if len(page_text.strip()) < 50:
-                # TODO: Implémenter l'OCR si nécessaire
-                # Cette partie nécessite l'installation de Tesseract OCR
-                pass
-            
-            extracted_text += page_text + "\n\n"
+        page_texts = [page_text for _, _, page_text in iter_pdf_pages(pdf_source)]
+        extracted_text = "".join(page_text + "\n\n" for page_text in page_texts)
         
         # Nettoyer le texte
         extracted_text = clean_pdf_text(extracted_text)
@@ -0,0 +1,122 @@
+"""
+Gestion de l'historique des quiz
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+from config import QUIZ_HISTORY_FOLDER
+
+# Statuts de la correction automatique d'un quiz
+GRADING_PENDING = "pending"
+GRADING_DONE = "done"
+
+_history_lock = threading.Lock()
+
+# Résultats dont la correction a été lancée par ce processus et n'est pas encore reportée.
+# Un résultat "pending" absent de cet ensemble a été laissé par un processus arrêté.
+_grading_in_progress = set()
+
+def save_quiz_result(note_title, questions, answers, scores, feedback=None, grading=None):
+    """
+    Enregistre le résultat d'un quiz dans l'historique
+
+    Args:
+        note_title (str): Titre de la note évaluée
+        questions (list): Questions posées
+        answers (list): Réponses données
+        scores (list): Scores de 0 à 5
+        feedback (list): Retours de la correction automatique (optionnel)
+        grading (str): Statut de la correction automatique (optionnel)
+
+    Returns:
+        str: Chemin du fichier enregistré
+    """
+    filename = os.path.join(QUIZ_HISTORY_FOLDER, f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.json")
+    data = {
+        "note_title": note_title,
+        "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "questions": questions,
+        "answers": answers,
+        "scores": scores,
+        "average_score": sum(scores) / len(scores) if scores else 0
+    }
+    if feedback is not None:
+        data["feedback"] = feedback
+    if grading is not None:
+        data["grading"] = {"status": grading, "ungraded": 0}
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    if grading == GRADING_PENDING:
+        with _history_lock:
+            _grading_in_progress.add(os.path.abspath(filename))
+    return filename
+
+def _read_quiz_result(filename):
+    with open(filename, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def load_quiz_result(filename):
+    """
+    Charge un résultat de quiz de l'historique. Une correction restée en
+    attente après l'arrêt du processus qui l'avait lancée est clôturée :
+    l'auto-évaluation est conservée.
+    """
+    data = _read_quiz_result(filename)
+    if data.get("grading", {}).get("status") != GRADING_PENDING:
+        return data
+
+    with _history_lock:
+        # Relire sous le verrou : la correction a pu être reportée entre-temps
+        data = _read_quiz_result(filename)
+        if (data.get("grading", {}).get("status") == GRADING_PENDING and
+                os.path.abspath(filename) not in _grading_in_progress):
+            data = _write_grades(filename, data, None)
+    return data
+
+def _write_grades(filename, data, grades):
+    grades = grades or [None] * len(data["questions"])
+
+    data["scores"] = [grade["score"] if grade else score
+                      for grade, score in zip(grades, data["scores"])]
+    data["feedback"] = [grade["feedback"] if grade else "" for grade in grades]
+    data["average_score"] = sum(data["scores"]) / len(data["scores"]) if data["scores"] else 0
+    data["grading"] = {
+        "status": GRADING_DONE,
+        "ungraded": sum(1 for grade in grades if grade is None),
+        # Les réponses vides sont notées 0 sans appel au modèle
+        "model_graded": sum(1 for grade, answer in zip(grades, data["answers"])
+                            if grade and answer.strip())
+    }
+
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    _grading_in_progress.discard(os.path.abspath(filename))
+    return data
+
+def apply_quiz_grades(filename, grades):
+    """
+    Reporte la correction automatique dans un résultat déjà enregistré.
+    L'auto-évaluation est conservée pour les réponses non corrigées.
+
+    Args:
+        filename (str): Chemin retourné par save_quiz_result
+        grades (list): Corrections {"score", "feedback"} ou None par question,
+                       ou None si la correction a entièrement échoué
+
+    Returns:
+        dict: Le résultat mis à jour
+    """
+    with _history_lock:
+        return _write_grades(filename, _read_quiz_result(filename), grades)
+
+def load_quiz_history():
+    """
+    Charge tous les quiz de l'historique
+    """
+    history = []
+    for filename in os.listdir(QUIZ_HISTORY_FOLDER):
+        if filename.endswith(".json"):
+            history.append(load_quiz_result(os.path.join(QUIZ_HISTORY_FOLDER, filename)))
+    return history
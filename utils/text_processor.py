@@ -3,20 +3,30 @@ Utilitaires pour le traitement de texte et la génération de quiz
 """
 
 import re
-import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.corpus import stopwords
+from config import TOKENIZER_BACKEND
+from utils.tokenizers import create_tokenizer
 
-# Télécharger les ressources NLTK nécessaires (à exécuter la première fois)
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+_tokenizer = None
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+def get_tokenizer():
+    """
+    Retourne le backend de découpage courant (créé au premier appel,
+    selon config.TOKENIZER_BACKEND)
+    """
+    global _tokenizer
+    if _tokenizer is None:
+        _tokenizer = create_tokenizer(TOKENIZER_BACKEND)
+    return _tokenizer
+
+def set_tokenizer_backend(name):
+    """
+    Change le backend de découpage en phrases et en mots
+
+    Args:
+        name (str): "regex" ou "nltk"
+    """
+    global _tokenizer
+    _tokenizer = create_tokenizer(name)
 
 def clean_text(text):
     """
@@ -33,6 +43,32 @@ def clean_text(text):
     
     return text.strip()
 
+def get_french_stopwords():
+    """
+    Retourne l'ensemble des mots vides français du backend courant
+    """
+    return get_tokenizer().stopwords
+
+def extract_terms(text):
+    """
+    Découpe un texte en termes significatifs : minuscules, alphanumériques,
+    de plus de 2 caractères et hors mots vides
+    
+    Args:
+        text (str): Le texte à découper
+        
+    Returns:
+        list: Liste des termes, dans l'ordre du texte
+    """
+    text = clean_text(text)
+    
+    # Tokenization
+    words = get_tokenizer().word_tokenize(text.lower())
+    
+    # Filtrer les mots vides
+    french_stopwords = get_french_stopwords()
+    return [word for word in words if word.isalnum() and word not in french_stopwords and len(word) > 2]
+
 def extract_key_concepts(text, num_concepts=10):
     """
     Extrait les concepts clés d'un texte en identifiant les termes les plus fréquents
@@ -45,14 +81,7 @@ def extract_key_concepts(text, num_concepts=10):
     Returns:
         list: Liste de tuples (concept, fréquence)
     """
-    text = clean_text(text)
-    
-    # Tokenization
-    words = word_tokenize(text.lower(), language='french')
-    
-    # Filtrer les mots vides
-    french_stopwords = set(stopwords.words('french'))
-    filtered_words = [word for word in words if word.isalnum() and word not in french_stopwords and len(word) > 2]
+    filtered_words = extract_terms(text)
     
     # Compter les fréquences
     word_freq = {}
@@ -79,7 +108,7 @@ def extract_sentences_with_concept(text, concept):
         list: Liste des phrases contenant le concept
     """
     text = clean_text(text)
-    sentences = sent_tokenize(text, language='french')
+    sentences = get_tokenizer().sent_tokenize(text)
     
     # Rechercher les phrases contenant le concept (insensible à la casse)
     pattern = re.compile(r'\b' + re.escape(concept) + r'\b', re.IGNORECASE)
@@ -121,4 +150,38 @@ def generate_quiz(text, num_questions=5):
     while len(questions) < num_questions:
         questions.append(f"Résumez la partie du texte qui traite des points clés.")
     
-    return questions
\ No newline at end of file
+    return questions
+
+def select_relevant_passages(text, query, max_passages=2, max_chars=600):
+    """
+    Sélectionne les passages d'un texte les plus proches d'une question
+    (recouvrement de mots significatifs), pour les joindre à une correction
+
+    Args:
+        text (str): Le texte de la note
+        query (str): La question (et éventuellement la réponse) à rapprocher
+        max_passages (int): Le nombre maximum de passages retournés
+        max_chars (int): La longueur maximale de chaque passage
+
+    Returns:
+        list: Liste des passages retenus, dans l'ordre du texte
+    """
+    query_words = {w for w in re.findall(r'\w+', query.lower()) if len(w) > 2}
+    if not query_words:
+        return []
+
+    # Découper en paragraphes, puis en fenêtres de taille bornée
+    passages = []
+    for paragraph in re.split(r'\n\s*\n|\n', text):
+        paragraph = paragraph.strip()
+        for start in range(0, len(paragraph), max_chars):
+            passages.append(paragraph[start:start + max_chars])
+
+    scored = []
+    for position, passage in enumerate(passages):
+        overlap = len(query_words.intersection(re.findall(r'\w+', passage.lower())))
+        if overlap:
+            scored.append((overlap, position))
+
+    best = sorted(scored, key=lambda x: (-x[0], x[1]))[:max_passages]
+    return [passages[position] for _, position in sorted(best, key=lambda x: x[1])]
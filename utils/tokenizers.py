@@ -0,0 +1,170 @@
+"""
+Backends de découpage en phrases et en mots pour le français.
+
+- "regex" : segmenteur à base d'expressions régulières compilées (abréviations,
+  nombres décimaux, élisions), sans dépendance
+- "nltk" : punkt et le tokenizer Treebank de NLTK, chargés à la demande
+"""
+
+import re
+
+# Mots vides français (identiques à la liste stopwords.words('french') de NLTK)
+FRENCH_STOPWORDS = frozenset("""
+au aux avec ce ces dans de des du elle en et eux il ils je la le les leur lui ma mais me
+même mes moi mon ne nos notre nous on ou par pas pour qu que qui sa se ses son sur ta te
+tes toi ton tu un une vos votre vous c d j l à m n s t y été étée étées étés étant étante
+étants étantes suis es est sommes êtes sont serai seras sera serons serez seront serais
+serait serions seriez seraient étais était étions étiez étaient fus fut fûmes fûtes furent
+sois soit soyons soyez soient fusse fusses fût fussions fussiez fussent ayant ayante
+ayantes ayants eu eue eues eus ai as avons avez ont aurai auras aura aurons aurez auront
+aurais aurait aurions auriez auraient avais avait avions aviez avaient eut eûmes eûtes
+eurent aie aies ait ayons ayez aient eusse eusses eût eussions eussiez eussent
+""".split())
+
+# Abréviations suivies d'un point qui ne terminent pas une phrase
+FRENCH_ABBREVIATIONS = frozenset("""
+m mm mme mmes mlle mlles dr drs pr mgr st ste cf ex p pp env chap fig éd av apr
+al ibid op cit vs resp sqq tél hab janv févr avr juil oct nov déc no n°
+""".split())
+
+# Abréviations qui sont aussi des mots courants ("sept", "vol", "art") : elles ne
+# sont traitées comme abréviations que suivies d'un nombre ("vol. 2", "sept. 2024")
+AMBIGUOUS_ABBREVIATIONS = frozenset(["sept", "vol", "art"])
+
+# Abréviations qui peuvent aussi clore une phrase (suivies d'une majuscule)
+SENTENCE_FINAL_ABBREVIATIONS = frozenset(["etc"])
+
+class RegexFrenchTokenizer:
+    """
+    Segmenteur français à base d'expressions régulières
+    """
+
+    name = "regex"
+
+    # Ponctuation finale, guillemets/parenthèses fermants éventuels (y compris « ... »
+    # à la française), espace, puis (sans les consommer) les symboles ouvrants et le
+    # premier caractère de la phrase suivante
+    _SENTENCE_END = re.compile(r'([.!?…]+)((?:\s*["»”’)\]])*)\s+(?=(\W*)(\w?))')
+
+    _WORD = re.compile(r"""
+        (?:jusqu|lorsqu|puisqu|quoiqu|qu|[cdjlmnst])['’](?=\w)  # élisions : l', qu', jusqu'...
+        | \d+(?:[.,]\d+)+                                         # nombres décimaux : 3,14
+        | \w+(?:['’-]\w+)*                                        # mots, y compris composés
+        | \.\.\.|[^\w\s]                                          # ponctuation
+        """, re.IGNORECASE | re.VERBOSE)
+
+    stopwords = FRENCH_STOPWORDS
+
+    def _is_boundary(self, text, match):
+        punctuation = match.group(1)
+        following = match.group(4)
+
+        # Une phrase commence par une majuscule, un chiffre ou un symbole
+        if following and following.islower():
+            return False
+        if punctuation != ".":
+            return True
+
+        # Mot précédant le point : abréviation ou initiale ?
+        start = text.rfind(" ", 0, match.start()) + 1
+        word = text[start:match.start()].lstrip("(«\"'").lower()
+        if word in SENTENCE_FINAL_ABBREVIATIONS:
+            return True
+        if word in FRENCH_ABBREVIATIONS:
+            return False
+        if word in AMBIGUOUS_ABBREVIATIONS:
+            return not following.isdigit()
+        if len(word) == 1 and word.isalpha():
+            return False
+        # Abréviations à points internes : c.-à-d, J.-C, p.ex
+        if "." in word:
+            return False
+        return True
+
+    def sent_tokenize(self, text):
+        """
+        Découpe un texte en phrases
+
+        Args:
+            text (str): Le texte à découper
+
+        Returns:
+            list: Liste des phrases
+        """
+        sentences = []
+        start = 0
+        for match in self._SENTENCE_END.finditer(text):
+            if self._is_boundary(text, match):
+                sentence = text[start:match.end(2)].strip()
+                if sentence:
+                    sentences.append(sentence)
+                start = match.end()
+        tail = text[start:].strip()
+        if tail:
+            sentences.append(tail)
+        return sentences
+
+    def word_tokenize(self, text):
+        """
+        Découpe un texte en mots et signes de ponctuation. Les élisions sont
+        séparées du mot qui suit ("l'objet" -> "l'", "objet").
+
+        Args:
+            text (str): Le texte à découper
+
+        Returns:
+            list: Liste des tokens
+        """
+        return self._WORD.findall(text)
+
+class NltkTokenizer:
+    """
+    Découpage via NLTK (punkt pour les phrases, Treebank pour les mots)
+    """
+
+    name = "nltk"
+
+    def __init__(self):
+        import nltk
+        from nltk.tokenize import sent_tokenize, word_tokenize
+        from nltk.corpus import stopwords
+
+        # Télécharger les ressources NLTK nécessaires (à exécuter la première fois)
+        try:
+            nltk.data.find('tokenizers/punkt')
+        except LookupError:
+            nltk.download('punkt')
+
+        try:
+            nltk.data.find('corpora/stopwords')
+        except LookupError:
+            nltk.download('stopwords')
+
+        self._sent_tokenize = sent_tokenize
+        self._word_tokenize = word_tokenize
+        self.stopwords = frozenset(stopwords.words('french'))
+
+    def sent_tokenize(self, text):
+        return self._sent_tokenize(text, language='french')
+
+    def word_tokenize(self, text):
+        return self._word_tokenize(text, language='french')
+
+TOKENIZER_BACKENDS = {
+    RegexFrenchTokenizer.name: RegexFrenchTokenizer,
+    NltkTokenizer.name: NltkTokenizer
+}
+
+def create_tokenizer(name):
+    """
+    Instancie un backend de découpage
+
+    Args:
+        name (str): "regex" ou "nltk"
+
+    Returns:
+        Objet exposant sent_tokenize, word_tokenize et stopwords
+    """
+    if name not in TOKENIZER_BACKENDS:
+        raise ValueError(f"Backend de découpage inconnu: {name} (choix: {', '.join(TOKENIZER_BACKENDS)})")
+    return TOKENIZER_BACKENDS[name]()